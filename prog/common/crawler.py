@@ -0,0 +1,175 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Асинхронный обходчик страниц: ограничение числа одновременных запросов,
+# ограничение частоты запросов к одному хосту, повторы с нарастающей паузой
+# и журнал прогресса, по которому прерванный обход продолжается с места остановки
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    def __init__(self, requests_per_second):
+        self.interval = 1 / requests_per_second if requests_per_second else 0
+        self._next = {}
+        self._locks = {}
+
+    async def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        await asyncio.sleep(start - now)
+
+
+# Журнал прогресса: строки {"queued": url} и {"done": url} в формате JSONL
+class CrawlState:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.queued = []
+        self.done = set()
+        if self.path and self.path.exists():
+            with open(self.path, encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    if 'queued' in record:
+                        self.queued.append(record['queued'])
+                    else:
+                        self.done.add(record['done'])
+        self._file = open(self.path, 'a', encoding='utf-8') if self.path else None
+
+    def pending(self):
+        return [url for url in self.queued if url not in self.done]
+
+    def _log(self, record):
+        if self._file:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+
+    def mark_queued(self, url):
+        self.queued.append(url)
+        self._log({'queued': url})
+
+    def mark_done(self, url):
+        self.done.add(url)
+        self._log({'done': url})
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        # Обход завершён без ошибок: журнал больше не нужен, и следующий
+        # запуск с тем же файлом начнёт обход заново, а не вернёт 0 страниц
+        self.close()
+        if self.path:
+            self.path.unlink(missing_ok=True)
+
+
+class Crawler:
+    def __init__(self, concurrency=8, requests_per_second=5.0, retries=3, backoff=0.5,
+                 timeout=30, state_file=None):
+        self.concurrency = concurrency
+        self.limiter = HostRateLimiter(requests_per_second)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.state_file = state_file
+
+    async def fetch(self, session, url):
+        for attempt in range(self.retries + 1):
+            await self.limiter.wait(url)
+            try:
+                async with session.get(url) as response:
+                    if response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return await response.text()
+                    error = aiohttp.ClientResponseError(
+                        response.request_info, response.history, status=response.status)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+
+    async def run(self, start_urls, parse, write):
+        # parse(url, html) -> (rows, next_urls); write(rows) выполняется в отдельном
+        # потоке по одному вызову за раз, пока следующие страницы уже скачиваются
+        state = CrawlState(self.state_file)
+        urls = asyncio.Queue()
+        rows_queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        seen = set(state.done)
+        stats = {'pages': 0, 'rows': 0, 'errors': 0, 'elapsed': 0.0}
+
+        def enqueue(url, log=True):
+            if url in seen:
+                return
+            seen.add(url)
+            if log:
+                state.mark_queued(url)
+            urls.put_nowait(url)
+
+        for url in state.pending():
+            enqueue(url, log=False)
+        for url in start_urls:
+            enqueue(url)
+
+        async def worker(session):
+            while True:
+                url = await urls.get()
+                try:
+                    html = await self.fetch(session, url)
+                    rows, next_urls = parse(url, html)
+                    for next_url in next_urls:
+                        enqueue(next_url)
+                    await rows_queue.put((url, rows))
+                except Exception as e:
+                    stats['errors'] += 1
+                    print(f"Ошибка загрузки {url}: {e}")
+                finally:
+                    urls.task_done()
+
+        async def writer(executor):
+            loop = asyncio.get_running_loop()
+            while True:
+                url, rows = await rows_queue.get()
+                try:
+                    await loop.run_in_executor(executor, write, rows)
+                    state.mark_done(url)
+                    stats['pages'] += 1
+                    stats['rows'] += len(rows)
+                except Exception as e:
+                    # Страница не отмечается выполненной и будет загружена при следующем запуске
+                    stats['errors'] += 1
+                    print(f"Ошибка записи {url}: {e}")
+                finally:
+                    rows_queue.task_done()
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                async with aiohttp.ClientSession(timeout=self.timeout) as session:
+                    tasks = [asyncio.create_task(worker(session)) for _ in range(self.concurrency)]
+                    writer_task = asyncio.create_task(writer(executor))
+                    await urls.join()
+                    await rows_queue.join()
+                    for task in tasks + [writer_task]:
+                        task.cancel()
+                    await asyncio.gather(*tasks, writer_task, return_exceptions=True)
+            if stats['errors'] == 0:
+                state.finish()
+        finally:
+            state.close()
+        stats['elapsed'] = time.perf_counter() - start
+        return stats
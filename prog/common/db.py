@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Общие настройки соединений: WAL позволяет читать параллельно с записью
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+}
+
+# sqlite3 кэширует подготовленные запросы по тексту SQL (по умолчанию 128)
+CACHED_STATEMENTS = 256
+
+
+def connect(database, readonly=False, check_same_thread=True, cached_statements=CACHED_STATEMENTS):
+    if readonly:
+        uri = Path(database).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread,
+                               cached_statements=cached_statements)
+    else:
+        conn = sqlite3.connect(database, check_same_thread=check_same_thread,
+                               cached_statements=cached_statements)
+    for name, value in PRAGMAS.items():
+        # Режим журнала меняет только пишущее соединение
+        if readonly and name == 'journal_mode':
+            continue
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+# Пул соединений: одно пишущее соединение под блокировкой
+# и отдельное читающее соединение для каждого потока.
+# Пишущее соединение открывается при первом writer(): оно переводит базу
+# в WAL, и пул, через который только читают, не должен менять файл базы
+class ConnectionPool:
+    def __init__(self, database, cached_statements=CACHED_STATEMENTS):
+        self.database = database
+        self.cached_statements = cached_statements
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+
+    def reader_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False только ради close() из другого потока
+            conn = connect(self.database, readonly=True, check_same_thread=False,
+                           cached_statements=self.cached_statements)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    @contextmanager
+    def reader(self):
+        yield self.reader_connection()
+
+    @contextmanager
+    def writer(self):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = connect(self.database, check_same_thread=False,
+                                       cached_statements=self.cached_statements)
+            try:
+                yield self._writer
+                self._writer.commit()
+            except BaseException:
+                self._writer.rollback()
+                raise
+
+    def close(self):
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,44 @@
+import sqlite3
+
+# Загрузка справочников (таблиц измерений): суррогатные ключи для всех
+# новых значений получаются одним пакетным upsert с RETURNING, а уже
+# известные берутся из кэша в памяти без обращений к базе
+
+# В одном INSERT не больше стольких значений (лимит параметров SQLite)
+UPSERT_CHUNK = 500
+
+
+class DimensionTable:
+    def __init__(self, table, column, key='id', chunk_size=UPSERT_CHUNK):
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise RuntimeError(f"Для RETURNING нужен SQLite 3.35+, установлен {sqlite3.sqlite_version}")
+        self.table = table
+        self.column = column
+        self.key = key
+        self.chunk_size = chunk_size
+        self.cache = {}
+
+    def _upsert(self, cursor, values):
+        # DO UPDATE с тем же значением нужен, чтобы RETURNING вернул id
+        # и для строк, которые уже были в таблице
+        placeholders = ', '.join(['(?)'] * len(values))
+        cursor.execute(f'''
+        INSERT INTO {self.table} ({self.column}) VALUES {placeholders}
+        ON CONFLICT({self.column}) DO UPDATE SET {self.column} = excluded.{self.column}
+        RETURNING {self.key}, {self.column}
+        ''', values)
+        for key, value in cursor.fetchall():
+            self.cache[value] = key
+
+    def resolve(self, cursor, values):
+        missing = list({value for value in values if value not in self.cache})
+        for start in range(0, len(missing), self.chunk_size):
+            self._upsert(cursor, missing[start:start + self.chunk_size])
+        return self.cache
+
+    def __getitem__(self, value):
+        return self.cache[value]
+
+    def clear(self):
+        # Нужно после отката транзакции: ключи из кэша могли не сохраниться
+        self.cache.clear()
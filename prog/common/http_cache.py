@@ -0,0 +1,83 @@
+import hashlib
+import json
+import time
+from pathlib import Path
+
+import requests
+
+# HTTP-кэш на диске: содержимое страниц хранится по хэшу содержимого
+# (objects/), а для каждого URL — запись с ETag/Last-Modified (index/)
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class HttpCache:
+    def __init__(self, cache_dir, offline=False, session=None, timeout=30):
+        self.root = Path(cache_dir)
+        self.offline = offline
+        self.session = session or requests.Session()
+        self.timeout = timeout
+
+    def _entry_path(self, url):
+        return self.root / 'index' / (_sha256(url.encode('utf-8')) + '.json')
+
+    def _object_path(self, digest):
+        return self.root / 'objects' / digest[:2] / digest
+
+    def _load_entry(self, url):
+        path = self._entry_path(url)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def _read(self, entry):
+        content = self._object_path(entry['digest']).read_bytes()
+        return content.decode(entry['encoding'])
+
+    def store(self, url, content, encoding='utf-8', etag=None, last_modified=None):
+        digest = _sha256(content)
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            object_path.write_bytes(content)
+        entry = {
+            'url': url,
+            'digest': digest,
+            'encoding': encoding,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+        }
+        entry_path = self._entry_path(url)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        entry_path.write_text(json.dumps(entry, ensure_ascii=False), encoding='utf-8')
+        return entry
+
+    def add_fixture(self, url, path, encoding='utf-8'):
+        # Сохранённая вручную страница становится ответом для URL в офлайн-режиме
+        return self.store(url, Path(path).read_bytes(), encoding)
+
+    def get(self, url):
+        entry = self._load_entry(url)
+        if self.offline:
+            if entry is None:
+                raise FileNotFoundError(f"Нет сохранённой копии страницы: {url}")
+            return self._read(entry)
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry is not None:
+            return self._read(entry)
+        response.raise_for_status()
+
+        entry = self.store(url, response.content, response.encoding or 'utf-8',
+                           response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return self._read(entry)
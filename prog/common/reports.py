@@ -0,0 +1,151 @@
+import csv
+import json
+import re
+import sys
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+# Потоковый вывод отчётов: строки читаются из курсора порциями через
+# fetchmany и сразу записываются, весь результат в памяти не хранится.
+# Текстовые таблицы и JSONL всех отчётов идут в один поток, а CSV пишется
+# по файлу на отчёт: у отчётов разные столбцы, и в одном файле CSV
+# получились бы несколько строк заголовка
+
+CHUNK_SIZE = 1000
+
+
+def iter_rows(cursor, chunk_size=CHUNK_SIZE):
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def _text(value):
+    return "" if value is None else value
+
+
+# Текстовая таблица: фиксированная ширина столбцов или шаблон строки
+class TableFormatter:
+    def __init__(self, out, columns, widths=None, template=None, report=None):
+        self.out = out
+        self.columns = columns
+        self.template = template
+        widths = widths or [max(len(column), 15) for column in columns]
+        self.row_format = " ".join("{:<%d}" % width for width in widths)
+
+    def header(self):
+        if self.template is None:
+            print(self.row_format.format(*self.columns), file=self.out)
+
+    def write(self, row):
+        if self.template is not None:
+            print(self.template.format(*row), file=self.out)
+        else:
+            print(self.row_format.format(*map(_text, row)), file=self.out)
+
+
+class CsvFormatter:
+    def __init__(self, out, columns, widths=None, template=None, report=None):
+        self.writer = csv.writer(out)
+        self.columns = columns
+
+    def header(self):
+        self.writer.writerow(self.columns)
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+
+class JsonlFormatter:
+    def __init__(self, out, columns, widths=None, template=None, report=None):
+        self.out = out
+        self.columns = columns
+        self.report = report
+
+    def header(self):
+        pass
+
+    def write(self, row):
+        record = {"report": self.report} if self.report else {}
+        record.update(zip(self.columns, row))
+        self.out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+FORMATS = {
+    "table": TableFormatter,
+    "csv": CsvFormatter,
+    "jsonl": JsonlFormatter,
+}
+
+
+def stream_report(cursor, fmt="table", out=None, columns=None, widths=None,
+                  template=None, report=None, chunk_size=CHUNK_SIZE):
+    # Курсор уже выполнил запрос; названия столбцов по умолчанию берутся из description
+    out = out or sys.stdout
+    columns = columns or [description[0] for description in cursor.description]
+    formatter = FORMATS[fmt](out, columns, widths, template, report)
+    formatter.header()
+    count = 0
+    for row in iter_rows(cursor, chunk_size):
+        formatter.write(row)
+        count += 1
+    return count
+
+
+def run_report(cursor, title, sql, params=(), fmt="table", out=None, columns=None,
+               widths=None, template=None, chunk_size=CHUNK_SIZE):
+    # В текстовом режиме заголовок печатается перед таблицей, в JSONL он
+    # попадает в поле report каждой записи, в CSV он задаёт имя файла
+    if fmt == "table":
+        print(f"\n{title}", file=out or sys.stdout)
+    cursor.execute(sql, params)
+    return stream_report(cursor, fmt, out, columns, widths, template,
+                         title if fmt == "jsonl" else None, chunk_size)
+
+
+def report_filename(title):
+    # "1. 5 самых популярных книг:" -> "1_5_самых_популярных_книг.csv"
+    return re.sub(r'\W+', '_', title).strip('_') + '.csv'
+
+
+@contextmanager
+def report_output(fmt="table", output=None):
+    # Отдаёт функцию title -> поток для этого отчёта. Для CSV output —
+    # каталог, в нём по файлу на отчёт; иначе файл или stdout для всех
+    with ExitStack() as stack:
+        if fmt == "csv":
+            if not output:
+                raise ValueError("Для CSV укажите каталог в --output: отчёты пишутся по файлу на отчёт")
+            directory = Path(output)
+            directory.mkdir(parents=True, exist_ok=True)
+
+            def open_report(title):
+                return stack.enter_context(
+                    open(directory / report_filename(title), 'w', newline='', encoding='utf-8'))
+        else:
+            out = stack.enter_context(open(output, 'w', newline='', encoding='utf-8')) if output else sys.stdout
+
+            def open_report(title):
+                return out
+        yield open_report
+
+
+def add_report_arguments(parser):
+    parser.add_argument('--format', choices=FORMATS, default='table', help='формат вывода отчётов')
+    parser.add_argument('--output', help='файл для отчётов (по умолчанию stdout); для csv — каталог, '
+                                         'куда отчёты пишутся по файлу на отчёт')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='строк на один fetchmany')
+
+
+def parse_report_arguments(parser):
+    args = parser.parse_args()
+    if args.format == 'csv' and not args.output:
+        parser.error('для --format csv нужен --output с каталогом: отчёты пишутся по файлу на отчёт')
+    return args
+
+
+def status_stream(args):
+    # Сообщения о ходе работы не смешиваются с CSV/JSONL в stdout
+    return sys.stdout if args.format == 'table' or args.output else sys.stderr
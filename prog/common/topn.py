@@ -0,0 +1,79 @@
+# Запросы «первые N» и «первые N в каждой группе» для SQLite.
+# Без группировки это ORDER BY ... LIMIT: при индексе по столбцу сортировки
+# SQLite читает только первые N записей индекса, а не сортирует всю таблицу.
+#
+# Для групп есть две стратегии:
+#   index  — для каждой группы отдельный ORDER BY ... LIMIT по индексу
+#            (группа, столбец сортировки); группы берутся через DISTINCT,
+#            который по тому же индексу перескакивает между группами.
+#            Читается около N записей индекса на группу;
+#   window — ROW_NUMBER() OVER (PARTITION BY ...), работает с любыми
+#            выражениями, но нумерует все строки таблицы.
+#
+# Выражения в columns, order_by, partition_by и where пишутся через
+# псевдоним основной таблицы (alias); where может ссылаться только на неё.
+# Параметры передаются по именам, N — параметр :top_n.
+
+STRATEGIES = ("index", "window")
+
+
+def _select_list(columns):
+    return ",\n        ".join(f"{expr} AS {name}" for expr, name in columns)
+
+
+def _where(condition, keyword="WHERE"):
+    return f"\n    {keyword} {condition}" if condition else ""
+
+
+def top_n_sql(table, alias, columns, order_by, partition_by=None, joins="", where=None,
+              key="id", strategy="index"):
+    if partition_by is None:
+        return f'''
+    SELECT
+        {_select_list(columns)}
+    FROM {table} {alias} {joins}{_where(where)}
+    ORDER BY {order_by}
+    LIMIT :top_n
+    '''
+    if strategy == "index":
+        return f'''
+    SELECT
+        {_select_list(columns)}
+    FROM (
+        SELECT DISTINCT {partition_by} AS group_key
+        FROM {table} {alias}{_where(where)}
+    ) AS groups
+    JOIN {table} {alias} ON {alias}.{key} IN (
+        SELECT {alias}.{key}
+        FROM {table} {alias}
+        WHERE {partition_by} = groups.group_key{_where(where, "AND")}
+        ORDER BY {order_by}
+        LIMIT :top_n
+    ) {joins}
+    ORDER BY groups.group_key, {order_by}
+    '''
+    if strategy == "window":
+        return f'''
+    WITH ranked AS (
+        SELECT
+            {alias}.{key} AS row_key,
+            {partition_by} AS group_key,
+            ROW_NUMBER() OVER (PARTITION BY {partition_by} ORDER BY {order_by}) AS group_rank
+        FROM {table} {alias}{_where(where)}
+    )
+    SELECT
+        {_select_list(columns)}
+    FROM ranked
+    JOIN {table} {alias} ON {alias}.{key} = ranked.row_key {joins}
+    WHERE ranked.group_rank <= :top_n
+    ORDER BY ranked.group_key, ranked.group_rank
+    '''
+    raise ValueError(f"Неизвестная стратегия: {strategy}")
+
+
+def top_n(cursor, table, alias, columns, order_by, n, partition_by=None, joins="", where=None,
+          params=None, key="id", strategy="index"):
+    # Результат читается из курсора, например через reports.stream_report
+    sql = top_n_sql(table, alias, columns, order_by, partition_by, joins, where, key, strategy)
+    cursor.execute(sql, dict(params or {}, top_n=n))
+    return cursor
@@ -0,0 +1,60 @@
+import argparse
+import time
+
+import numpy as np
+
+from geometry.batch import ShapeBatch
+from geometry.rectangle import Rectangle
+from geometry.triangle import Triangle
+from geometry.trapezoid import Trapezoid
+
+SHAPES = {
+    "rectangle": Rectangle,
+    "triangle": Triangle,
+    "trapezoid": Trapezoid,
+}
+
+
+def random_columns(shape, count, rng):
+    columns = [rng.uniform(1, 100, count) for _ in range(3)]
+    if shape == "rectangle":
+        return columns[:2]
+    if shape == "triangle":
+        # Третья сторона строится так, чтобы треугольник существовал
+        a, b, t = columns
+        return [a, b, np.abs(a - b) + t / 100 * (a + b - np.abs(a - b))]
+    return columns
+
+
+def per_object_loop(shape, columns):
+    cls = SHAPES[shape]
+    results = []
+    for params in zip(*(column.tolist() for column in columns)):
+        figure = cls(*params)
+        results.append((figure.area(), figure.circumradius(), figure.inradius()))
+    return results
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение пакетного и поштучного расчёта")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print("{:<12} {:>12} {:>12} {:>10}".format("Фигура", "Цикл, с", "Пакет, с", "Ускорение"))
+    for shape in SHAPES:
+        columns = random_columns(shape, args.count, rng)
+        loop_time = measure(per_object_loop, shape, columns)
+        batch_time = measure(lambda: ShapeBatch(shape, *columns).compute())
+        print("{:<12} {:>12.3f} {:>12.3f} {:>9.1f}x".format(
+            shape, loop_time, batch_time, loop_time / batch_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Результат пакетного расчёта: массивы метрик и маска корректных фигур
+BatchResult = namedtuple("BatchResult", ["area", "circumradius", "inradius", "valid"])
+
+
+def _columns(*columns):
+    # Принимаем списки, array('d'), memoryview и массивы NumPy без лишних копий
+    return [np.asarray(column, dtype=np.float64) for column in columns]
+
+
+def _result(area, circumradius, inradius, valid):
+    # Для некорректных фигур все метрики — NaN, как у вырожденных треугольников
+    return BatchResult(np.where(valid, area, np.nan), np.where(valid, circumradius, np.nan),
+                       np.where(valid, inradius, np.nan), valid)
+
+
+def rectangle_metrics(width, height):
+    width, height = _columns(width, height)
+    valid = (width > 0) & (height > 0)
+    area = width * height
+    circumradius = np.hypot(width, height) / 2
+    inradius = np.minimum(width, height) / 2
+    return _result(area, circumradius, inradius, valid)
+
+
+def triangle_metrics(a, b, c):
+    a, b, c = _columns(a, b, c)
+    s = (a + b + c) / 2
+    product = s * (s - a) * (s - b) * (s - c)
+
+    # Вырожденные треугольники не вызывают ValueError, а помечаются в маске
+    valid = (a > 0) & (b > 0) & (c > 0) & (product > 0)
+    area = np.sqrt(np.where(valid, product, np.nan))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        circumradius = (a * b * c) / (4 * area)
+        inradius = area / s
+    return _result(area, circumradius, inradius, valid)
+
+
+def trapezoid_metrics(a, b, height):
+    a, b, height = _columns(a, b, height)
+    valid = (a > 0) & (b > 0) & (height > 0)
+    area = ((a + b) / 2) * height
+    # Простое приближение для радиуса описанной окружности, как в Trapezoid
+    circumradius = (a + b) / 2
+    inradius = height / 2
+    return _result(area, circumradius, inradius, valid)
+
+
+class ShapeBatch:
+    # Набор однотипных фигур, заданных столбцами параметров
+    metrics = {
+        "rectangle": rectangle_metrics,
+        "triangle": triangle_metrics,
+        "trapezoid": trapezoid_metrics,
+    }
+
+    def __init__(self, shape, *columns):
+        if shape not in self.metrics:
+            raise ValueError("Неверная фигура.")
+        self.shape = shape
+        self.columns = _columns(*columns)
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def compute(self):
+        return self.metrics[self.shape](*self.columns)
@@ -1,17 +1,31 @@
 import math
 
 class Triangle:
+    # Полупериметр и площадь кэшируются и сбрасываются при изменении сторон
     def __init__(self, a, b, c):
         self.a = a
         self.b = b
         self.c = c
 
+    def __setattr__(self, attr, value):
+        super().__setattr__(attr, value)
+        if attr in ('a', 'b', 'c'):
+            self.__dict__['_semiperimeter'] = None
+            self.__dict__['_area'] = None
+
+    def semiperimeter(self):
+        if self._semiperimeter is None:
+            self._semiperimeter = (self.a + self.b + self.c) / 2
+        return self._semiperimeter
+
     def area(self):
-        s = (self.a + self.b + self.c) / 2
-        return math.sqrt(s * (s - self.a) * (s - self.b) * (s - self.c))
+        if self._area is None:
+            s = self.semiperimeter()
+            self._area = math.sqrt(s * (s - self.a) * (s - self.b) * (s - self.c))
+        return self._area
 
     def circumradius(self):
         return (self.a * self.b * self.c) / (4 * self.area())
 
     def inradius(self):
-        return self.area() / ((self.a + self.b + self.c) / 2)
+        return self.area() / self.semiperimeter()
@@ -74,12 +74,11 @@ class GeometryApp:
             filepath = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
             if not filepath:
                 return
-            workbook = openpyxl.Workbook()
-            sheet = workbook.active
-            sheet.title = "Results"
-            for i, (key, value) in enumerate(self.results.items(), start=1):
-                sheet[f"A{i}"] = key
-                sheet[f"B{i}"] = value
+            # Потоковый режим: строки не хранятся в памяти как объекты ячеек
+            workbook = openpyxl.Workbook(write_only=True)
+            sheet = workbook.create_sheet("Results")
+            for key, value in self.results.items():
+                sheet.append([key, value])
             workbook.save(filepath)
             messagebox.showinfo("Успех", "Результаты сохранены в Excel.")
         except Exception as e:
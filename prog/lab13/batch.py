@@ -0,0 +1,157 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+import report
+from lab13 import Rectangle, Triangle, Trapezoid
+
+# Фигуры можно задавать как русскими названиями из интерфейса, так и английскими
+SHAPES = {
+    "Прямоугольник": Rectangle,
+    "Треугольник": Triangle,
+    "Трапеция": Trapezoid,
+    "rectangle": Rectangle,
+    "triangle": Triangle,
+    "trapezoid": Trapezoid,
+}
+
+FIELDS = ["shape", "area", "inscribed_radius", "circumscribed_radius", "error"]
+
+
+# Чтение строк: CSV вида "shape,a,b,c" или JSONL вида {"shape": ..., "params": [...]}.
+# Читатель отдаёт (фигура, параметры) или (фигура, параметры, ошибка разбора)
+def read_csv(stream):
+    for row in csv.reader(stream):
+        if not row or row[0] == "shape":
+            continue
+        yield row[0], [cell for cell in row[1:] if cell != ""]
+
+
+def read_jsonl(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        # Битая строка не прерывает обработку: ошибка уходит в столбец error
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield None, [], f"Некорректный JSON: {e}"
+            continue
+        if not isinstance(record, dict) or "shape" not in record:
+            yield None, [], "В записи нет поля shape"
+            continue
+        yield record["shape"], record.get("params", [])
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+
+
+def compute(shape_name, params, error=None):
+    # error — ошибка разбора строки на чтении, тогда фигура не считается
+    result = {"shape": shape_name, "area": None, "inscribed_radius": None,
+              "circumscribed_radius": None, "error": error}
+    if error is not None:
+        return result
+    try:
+        shape = SHAPES[shape_name](*(float(p) for p in params))
+        result["area"] = shape.area()
+        result["inscribed_radius"] = shape.inscribed_radius()
+        result["circumscribed_radius"] = shape.circumscribed_radius()
+    except KeyError:
+        result["error"] = f"Неизвестная фигура: {shape_name}"
+    except (TypeError, ValueError, ZeroDivisionError) as e:
+        result["error"] = str(e)
+    return result
+
+
+# Запись результатов построчно, без накопления в памяти
+class CsvResultWriter:
+    def __init__(self, stream):
+        self.writer = csv.writer(stream)
+        self.writer.writerow(FIELDS)
+
+    def write(self, result):
+        self.writer.writerow(["" if result[f] is None else result[f] for f in FIELDS])
+
+
+class JsonlResultWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, result):
+        self.stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+WRITERS = {"csv": CsvResultWriter, "jsonl": JsonlResultWriter}
+
+
+def results(rows, stats, progress_every=1_000_000, log=sys.stderr):
+    start = time.perf_counter()
+    for row in rows:
+        yield compute(*row)
+        stats["count"] += 1
+        if progress_every and stats["count"] % progress_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"Обработано {stats['count']} строк, {stats['count'] / elapsed:.0f} строк/с", file=log)
+    stats["elapsed"] = time.perf_counter() - start
+
+
+def process(rows, writer, progress_every=1_000_000, log=sys.stderr):
+    stats = {"count": 0, "elapsed": 0.0}
+    for result in results(rows, stats, progress_every, log):
+        writer.write(result)
+    return stats["count"], stats["elapsed"]
+
+
+def export_report(rows, path, progress_every=1_000_000, log=sys.stderr):
+    # Excel и Word пишутся через потоковый экспортёр отчётов
+    stats = {"count": 0, "elapsed": 0.0}
+    table = ([result[f] for f in FIELDS] for result in results(rows, stats, progress_every, log))
+    report.export(path, FIELDS, table)
+    return stats["count"], stats["elapsed"]
+
+
+def detect_format(path, default="csv"):
+    if path and path.endswith(".jsonl"):
+        return "jsonl"
+    return default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный расчёт фигур без графического интерфейса")
+    parser.add_argument("input", nargs="?", help="входной файл (по умолчанию stdin)")
+    parser.add_argument("-o", "--output", help="выходной файл (по умолчанию stdout)")
+    parser.add_argument("--input-format", choices=READERS)
+    parser.add_argument("--output-format", choices=WRITERS)
+    parser.add_argument("--progress", type=int, default=1_000_000,
+                        help="как часто сообщать о скорости обработки (0 — только итог)")
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or detect_format(args.input)
+    output_format = args.output_format or detect_format(args.output, input_format)
+
+    source = open(args.input, newline="", encoding="utf-8") if args.input else sys.stdin
+    try:
+        rows = READERS[input_format](source)
+        if args.output and args.output.endswith((".xlsx", ".docx")):
+            count, elapsed = export_report(rows, args.output, args.progress)
+        else:
+            target = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+            try:
+                count, elapsed = process(rows, WRITERS[output_format](target), args.progress)
+            finally:
+                if args.output:
+                    target.close()
+    finally:
+        if args.input:
+            source.close()
+
+    rate = count / elapsed if elapsed else 0
+    print(f"Готово: {count} строк за {elapsed:.2f} с ({rate:.0f} строк/с)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from lab13 import Triangle
+from shape_store import ShapeStore
+
+
+def random_sides():
+    a = random.uniform(1, 100)
+    b = random.uniform(1, 100)
+    c = random.uniform(abs(a - b) + 0.01, a + b - 0.01)
+    return a, b, c
+
+
+def measure_memory(build, count):
+    tracemalloc.start()
+    result = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size / count
+
+
+def build_objects(count):
+    return [Triangle(*random_sides()) for _ in range(count)]
+
+
+def build_store(count):
+    store = ShapeStore()
+    for _ in range(count):
+        store.append(Triangle, *random_sides())
+    return store
+
+
+# Прежняя реализация без кэша: каждая метрика заново считает формулу Герона
+class UncachedTriangle:
+    __slots__ = ['a', 'b', 'c']
+
+    def __init__(self, a, b, c):
+        self.a = a
+        self.b = b
+        self.c = c
+
+    def area(self):
+        s = (self.a + self.b + self.c) / 2
+        return math.sqrt(s * (s - self.a) * (s - self.b) * (s - self.c))
+
+    def inscribed_radius(self):
+        return self.area() / ((self.a + self.b + self.c) / 2)
+
+    def circumscribed_radius(self):
+        return (self.a * self.b * self.c) / (4 * self.area())
+
+
+def measure_queries(triangles, repeats):
+    start = time.perf_counter()
+    for triangle in triangles:
+        for _ in range(repeats):
+            triangle.area()
+            triangle.inscribed_radius()
+            triangle.circumscribed_radius()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Память на фигуру: объекты против колоночного хранилища")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=10, help="повторных запросов метрик на фигуру")
+    args = parser.parse_args()
+
+    _, per_object = measure_memory(build_objects, args.count)
+    store, per_row = measure_memory(build_store, args.count)
+    print(f"Объекты Triangle: {per_object:.1f} байт на фигуру")
+    print(f"ShapeStore:       {per_row:.1f} байт на фигуру ({store.nbytes / args.count:.0f} байт данных)")
+
+    sides = [random_sides() for _ in range(args.count)]
+    uncached = measure_queries([UncachedTriangle(*s) for s in sides], args.repeats)
+    cached = measure_queries([Triangle(*s) for s in sides], args.repeats)
+    print(f"Повторные запросы метрик: без кэша {uncached:.2f} с, с кэшем {cached:.2f} с "
+          f"(ускорение {uncached / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog
 from abc import ABC, abstractmethod
-from docx import Document
-import openpyxl
 import math
 
+import report
+
 
 # Абстрактный базовый класс для геометрической фигуры
 class Shape(ABC):
-    def __init__(self, name):
-        self.name = name
+    # Пустые __slots__ убирают __dict__ у всех фигур, а название
+    # хранится одно на класс, а не копией в каждом экземпляре
+    __slots__ = ()
+    name = None
 
     # Абстрактные методы для расчёта площади и радиусов
     @abstractmethod
@@ -31,9 +33,9 @@ class Shape(ABC):
 # Прямоугольник
 class Rectangle(Shape):
     __slots__ = ['length', 'width']
+    name = 'Прямоугольник'
 
     def __init__(self, length, width):
-        super().__init__('Прямоугольник')
         self.length = length
         self.width = width
 
@@ -52,23 +54,45 @@ class Rectangle(Shape):
 
 # Треугольник
 class Triangle(Shape):
-    __slots__ = ['a', 'b', 'c']
+    # Полупериметр, площадь и радиусы вычисляются один раз и сбрасываются
+    # при изменении любой из сторон
+    __slots__ = ['a', 'b', 'c', '_semiperimeter', '_area', '_inscribed', '_circumscribed']
+    name = 'Треугольник'
 
     def __init__(self, a, b, c):
-        super().__init__('Треугольник')
         self.a = a
         self.b = b
         self.c = c
 
+    def __setattr__(self, attr, value):
+        super().__setattr__(attr, value)
+        if attr in ('a', 'b', 'c'):
+            self._invalidate()
+
+    def _invalidate(self):
+        for attr in ('_semiperimeter', '_area', '_inscribed', '_circumscribed'):
+            object.__setattr__(self, attr, None)
+
+    def semiperimeter(self):
+        if self._semiperimeter is None:
+            self._semiperimeter = (self.a + self.b + self.c) / 2
+        return self._semiperimeter
+
     def area(self):
-        s = (self.a + self.b + self.c) / 2
-        return math.sqrt(s * (s - self.a) * (s - self.b) * (s - self.c))
+        if self._area is None:
+            s = self.semiperimeter()
+            self._area = math.sqrt(s * (s - self.a) * (s - self.b) * (s - self.c))
+        return self._area
 
     def inscribed_radius(self):
-        return self.area() / ((self.a + self.b + self.c) / 2)
+        if self._inscribed is None:
+            self._inscribed = self.area() / self.semiperimeter()
+        return self._inscribed
 
     def circumscribed_radius(self):
-        return (self.a * self.b * self.c) / (4 * self.area())
+        if self._circumscribed is None:
+            self._circumscribed = (self.a * self.b * self.c) / (4 * self.area())
+        return self._circumscribed
 
     def __repr__(self):
         return f"Triangle(a={self.a}, b={self.b}, c={self.c})"
@@ -77,9 +101,9 @@ class Triangle(Shape):
 # Трапеция
 class Trapezoid(Shape):
     __slots__ = ['a', 'b', 'h']
+    name = 'Трапеция'
 
     def __init__(self, a, b, h):
-        super().__init__('Трапеция')
         self.a = a
         self.b = b
         self.h = h
@@ -99,6 +123,10 @@ class Trapezoid(Shape):
         return f"Trapezoid(a={self.a}, b={self.b}, h={self.h})"
 
 
+# Заголовки столбцов отчёта
+REPORT_HEADER = ["Фигура", "Площадь", "Вписанный радиус", "Описанный радиус"]
+
+
 # Приложение GUI
 class GeometryApp:
     def __init__(self, root):
@@ -107,6 +135,7 @@ class GeometryApp:
 
         # Создание переменных
         self.shape = None
+        self.results = None  # последний успешный расчёт для отчёта
         self.result_text = tk.StringVar()
 
         # Создание интерфейса
@@ -158,27 +187,24 @@ class GeometryApp:
             inscribed = self.shape.inscribed_radius()
             circumscribed = self.shape.circumscribed_radius()
 
+            self.results = [self.shape.name, area, inscribed, circumscribed]
             self.result_text.set(f"Площадь: {area:.2f}, Вписанный радиус: {inscribed}, Описанный радиус: {circumscribed}")
         except Exception as e:
+            # Старый результат не должен попасть в отчёт после неудачного расчёта
+            self.results = None
+            self.result_text.set("")
             messagebox.showerror("Ошибка", f"Ошибка ввода данных: {e}")
 
     def save_report(self):
+        if self.results is None:
+            messagebox.showwarning("Нет данных", "Сначала выполните расчёт.")
+            return
         try:
-            filepath = filedialog.asksaveasfilename(defaultextension=".docx", filetypes=[("Word files", "*.docx"), ("Excel files", "*.xlsx")])
+            filepath = filedialog.asksaveasfilename(defaultextension=".docx", filetypes=[("Word files", "*.docx"), ("Excel files", "*.xlsx"), ("CSV files", "*.csv")])
             if not filepath:
                 return
 
-            if filepath.endswith(".docx"):
-                doc = Document()
-                doc.add_heading("Результаты расчетов", level=1)
-                doc.add_paragraph(self.result_text.get())
-                doc.save(filepath)
-            elif filepath.endswith(".xlsx"):
-                wb = openpyxl.Workbook()
-                ws = wb.active
-                ws.title = "Результаты"
-                ws.append(["Результаты", self.result_text.get()])
-                wb.save(filepath)
+            report.export(filepath, REPORT_HEADER, [self.results])
 
             messagebox.showinfo("Успех", "Результаты успешно сохранены.")
         except Exception as e:
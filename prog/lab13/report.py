@@ -0,0 +1,96 @@
+import csv
+import warnings
+
+import openpyxl
+from docx import Document
+from docx.oxml import OxmlElement
+
+# Выгрузка результатов: строки передаются итератором. CSV и XLSX пишутся
+# по мере поступления, и память не растёт с числом строк. Word так не
+# умеет: python-docx держит весь документ в памяти до save, поэтому для
+# больших выгрузок нужно выбирать CSV или XLSX
+
+# Начиная с этого числа строк write_docx предупреждает о расходе памяти
+DOCX_WARN_ROWS = 50_000
+
+
+def write_csv(path, header, rows):
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_xlsx(path, header, rows, title="Результаты"):
+    # В режиме write_only openpyxl сразу сбрасывает строки во временный файл
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+    ws.append(header)
+    count = 0
+    for row in rows:
+        ws.append(row)
+        count += 1
+    wb.save(path)
+    return count
+
+
+def _format_cell(value):
+    if value is None:
+        return "—"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def _add_row(tbl, values):
+    # Строка собирается напрямую из XML-элементов: add_row и cell.text
+    # на каждую ячейку работают на порядок медленнее
+    tr = OxmlElement("w:tr")
+    for value in values:
+        tc = OxmlElement("w:tc")
+        paragraph = OxmlElement("w:p")
+        run = OxmlElement("w:r")
+        text = OxmlElement("w:t")
+        text.text = _format_cell(value)
+        run.append(text)
+        paragraph.append(run)
+        tc.append(paragraph)
+        tr.append(tc)
+    tbl.append(tr)
+
+
+def write_docx(path, header, rows, title="Результаты расчетов"):
+    # Память растёт линейно с числом строк: весь документ собирается до save
+    doc = Document()
+    doc.add_heading(title, level=1)
+    table = doc.add_table(rows=1, cols=len(header))
+    for cell, value in zip(table.rows[0].cells, header):
+        cell.text = value
+    tbl = table._tbl
+    count = 0
+    for row in rows:
+        _add_row(tbl, row)
+        count += 1
+        if count == DOCX_WARN_ROWS:
+            warnings.warn(f"Отчёт Word больше {DOCX_WARN_ROWS} строк собирается целиком в памяти, "
+                          f"для больших выгрузок используйте CSV или XLSX", stacklevel=2)
+    doc.save(path)
+    return count
+
+
+WRITERS = {
+    ".csv": write_csv,
+    ".xlsx": write_xlsx,
+    ".docx": write_docx,
+}
+
+
+def export(path, header, rows):
+    for extension, writer in WRITERS.items():
+        if path.endswith(extension):
+            return writer(path, header, rows)
+    raise ValueError(f"Неподдерживаемый формат файла: {path}")
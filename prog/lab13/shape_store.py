@@ -0,0 +1,136 @@
+import math
+from array import array
+
+from lab13 import Rectangle, Triangle, Trapezoid
+
+
+# Свойство-представление: значение читается и пишется прямо в столбец хранилища
+def _column_property(index):
+    def getter(self):
+        return self._columns[index][self._index]
+
+    def setter(self, value):
+        self._columns[index][self._index] = value
+
+    return property(getter, setter)
+
+
+def _view_init(self, columns, index):
+    self._columns = columns
+    self._index = index
+
+
+# Представления строк хранилища с тем же API, что и у обычных фигур
+class RectangleView(Rectangle):
+    __slots__ = ['_columns', '_index']
+    __init__ = _view_init
+    length = _column_property(0)
+    width = _column_property(1)
+
+
+# Метрики треугольника в представлении не кэшируются: столбец общий
+# для всех представлений и memoryview из columns(), и кэш одного
+# представления не узнал бы о записи через другое
+class TriangleView(Triangle):
+    __slots__ = ['_columns', '_index']
+    __init__ = _view_init
+    a = _column_property(0)
+    b = _column_property(1)
+    c = _column_property(2)
+
+    def semiperimeter(self):
+        return (self.a + self.b + self.c) / 2
+
+    def area(self):
+        a, b, c = self.a, self.b, self.c
+        s = (a + b + c) / 2
+        return math.sqrt(s * (s - a) * (s - b) * (s - c))
+
+    def inscribed_radius(self):
+        return self.area() / self.semiperimeter()
+
+    def circumscribed_radius(self):
+        return (self.a * self.b * self.c) / (4 * self.area())
+
+
+class TrapezoidView(Trapezoid):
+    __slots__ = ['_columns', '_index']
+    __init__ = _view_init
+    a = _column_property(0)
+    b = _column_property(1)
+    h = _column_property(2)
+
+
+# Вид фигуры -> (поля конструктора, класс представления)
+KINDS = {
+    Rectangle: (('length', 'width'), RectangleView),
+    Triangle: (('a', 'b', 'c'), TriangleView),
+    Trapezoid: (('a', 'b', 'h'), TrapezoidView),
+}
+
+
+# Колоночное хранилище фигур: по одному array('d') на каждый параметр
+# каждого вида, поэтому фигура занимает 8 байт на параметр
+class ShapeStore:
+    def __init__(self):
+        self._columns = {
+            kind: tuple(array('d') for _ in fields)
+            for kind, (fields, _) in KINDS.items()
+        }
+
+    @staticmethod
+    def kind_of(shape):
+        for kind in KINDS:
+            if isinstance(shape, kind):
+                return kind
+        raise TypeError(f"Неизвестная фигура: {shape!r}")
+
+    def append(self, kind, *params):
+        columns = self._columns[kind]
+        if len(params) != len(columns):
+            raise TypeError(f"{kind.__name__} ожидает {len(columns)} параметра")
+        for column, value in zip(columns, params):
+            column.append(value)
+        return len(columns[0]) - 1
+
+    def add(self, shape):
+        kind = self.kind_of(shape)
+        fields = KINDS[kind][0]
+        return self.append(kind, *(getattr(shape, field) for field in fields))
+
+    def extend(self, shapes):
+        for shape in shapes:
+            self.add(shape)
+
+    def count(self, kind):
+        return len(self._columns[kind][0])
+
+    def __len__(self):
+        return sum(self.count(kind) for kind in KINDS)
+
+    def view(self, kind, index):
+        if not -self.count(kind) <= index < self.count(kind):
+            raise IndexError("Индекс фигуры вне диапазона")
+        return KINDS[kind][1](self._columns[kind], index % self.count(kind))
+
+    def views(self, kind):
+        view_cls = KINDS[kind][1]
+        columns = self._columns[kind]
+        for index in range(self.count(kind)):
+            yield view_cls(columns, index)
+
+    def __iter__(self):
+        for kind in KINDS:
+            yield from self.views(kind)
+
+    def columns(self, kind):
+        # memoryview без копирования, подходит и для numpy.frombuffer
+        return tuple(memoryview(column) for column in self._columns[kind])
+
+    @property
+    def nbytes(self):
+        return sum(
+            column.itemsize * len(column)
+            for columns in self._columns.values()
+            for column in columns
+        )
@@ -0,0 +1,160 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from faker import Faker
+
+from library_db import (GENRES, STATUSES, create_database_schema, create_statistics_triggers,
+                        drop_statistics_triggers, rebuild_statistics)
+
+# Базовый масштаб соответствует исходному набору: 100 книг, 50 читателей, 200 выдач
+BOOKS_PER_SCALE = 100
+READERS_PER_SCALE = 50
+ISSUES_PER_SCALE = 200
+
+
+# Генерация в дочерних процессах: у каждого куска свой Faker и свой seed
+def generate_books_chunk(args):
+    seed, count = args
+    fake = Faker('ru_RU')
+    fake.seed_instance(seed)
+    rnd = random.Random(seed)
+    return [
+        (fake.catch_phrase(), fake.name(), rnd.choice(GENRES), rnd.randint(1950, 2023))
+        for _ in range(count)
+    ]
+
+
+def generate_readers_chunk(args):
+    seed, count = args
+    fake = Faker('ru_RU')
+    fake.seed_instance(seed)
+    rnd = random.Random(seed)
+    return [
+        (fake.name(), fake.email(), rnd.choice(STATUSES))
+        for _ in range(count)
+    ]
+
+
+def generate_issues_chunk(args):
+    # Faker здесь не нужен: даты выдачи считаются от сегодняшнего дня.
+    # Выдачи ссылаются на книги и читателей из диапазонов id этой загрузки
+    seed, count, (first_book, last_book), (first_reader, last_reader) = args
+    rnd = random.Random(seed)
+    today = date.today()
+    rows = []
+    for _ in range(count):
+        issue_date = today - timedelta(days=rnd.randint(0, 365))
+        # 70% книг возвращены
+        if rnd.random() < 0.7:
+            return_date = issue_date + timedelta(days=rnd.randint(1, 60))
+        else:
+            return_date = None
+        rows.append((rnd.randint(first_book, last_book), rnd.randint(first_reader, last_reader),
+                     issue_date.isoformat(), return_date and return_date.isoformat()))
+    return rows
+
+
+def split_tasks(total, batch_size, seed):
+    return [(seed + i, min(batch_size, total - start))
+            for i, start in enumerate(range(0, total, batch_size))]
+
+
+def loaded_ids(conn, table, count):
+    # AUTOINCREMENT внутри одной транзакции выдаёт подряд идущие id,
+    # поэтому только что вставленные строки — последние count id таблицы.
+    # В уже заполненной базе они начинаются не с 1
+    last = conn.execute(f'SELECT MAX(id) FROM {table}').fetchone()[0]
+    return last - count + 1, last
+
+
+def set_load_pragmas(conn, journal_mode, synchronous):
+    # На время загрузки ослабляем гарантии записи ради скорости
+    previous = (conn.execute('PRAGMA journal_mode').fetchone()[0],
+                conn.execute('PRAGMA synchronous').fetchone()[0])
+    conn.execute(f'PRAGMA journal_mode = {journal_mode}')
+    conn.execute(f'PRAGMA synchronous = {synchronous}')
+    return previous
+
+
+def bulk_populate(conn, scale, batch_size=50_000, workers=None, seed=0,
+                  journal_mode='MEMORY', synchronous='OFF'):
+    books_count = BOOKS_PER_SCALE * scale
+    readers_count = READERS_PER_SCALE * scale
+    issues_count = ISSUES_PER_SCALE * scale
+
+    # Без журнала ROLLBACK в SQLite не определён, поэтому в режиме OFF
+    # триггеры статистики не снимаются, а при ошибке откат не делается:
+    # вставленные строки остаются, но сводки по ним уже посчитаны триггерами
+    journal_off = journal_mode.upper() == 'OFF'
+    previous = set_load_pragmas(conn, journal_mode, synchronous)
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    try:
+        cursor.execute('BEGIN')
+        if not journal_off:
+            drop_statistics_triggers(conn)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rows in pool.map(generate_books_chunk, split_tasks(books_count, batch_size, seed)):
+                cursor.executemany('''
+                INSERT INTO Books (title, author, genre, year)
+                VALUES (?, ?, ?, ?)
+                ''', rows)
+
+            for rows in pool.map(generate_readers_chunk, split_tasks(readers_count, batch_size, seed)):
+                cursor.executemany('''
+                INSERT INTO Readers (full_name, contact, membership_status)
+                VALUES (?, ?, ?)
+                ''', rows)
+
+            book_ids = loaded_ids(conn, 'Books', books_count)
+            reader_ids = loaded_ids(conn, 'Readers', readers_count)
+            issue_tasks = [(task_seed, count, book_ids, reader_ids)
+                           for task_seed, count in split_tasks(issues_count, batch_size, seed)]
+            for rows in pool.map(generate_issues_chunk, issue_tasks):
+                cursor.executemany('''
+                INSERT INTO BookIssues (book_id, reader_id, issue_date, return_date)
+                VALUES (?, ?, ?, ?)
+                ''', rows)
+        if not journal_off:
+            rebuild_statistics(conn)
+            create_statistics_triggers(conn)
+        conn.commit()
+    except BaseException:
+        if journal_off:
+            conn.commit()
+        else:
+            conn.rollback()
+        raise
+    finally:
+        set_load_pragmas(conn, *previous)
+
+    elapsed = time.perf_counter() - start
+    return books_count + readers_count + issues_count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Массовая генерация данных для базы библиотеки")
+    parser.add_argument('--db', default='library.db', help='файл базы данных')
+    parser.add_argument('--scale', type=int, default=1,
+                        help='множитель объёма: 1 = 100 книг, 50 читателей, 200 выдач')
+    parser.add_argument('--batch-size', type=int, default=50_000, help='строк на один executemany')
+    parser.add_argument('--workers', type=int, default=None, help='число процессов генерации')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--journal-mode', default='MEMORY',
+                        choices=['DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'])
+    parser.add_argument('--synchronous', default='OFF', choices=['OFF', 'NORMAL', 'FULL', 'EXTRA'])
+    args = parser.parse_args()
+
+    conn = create_database_schema(args.db)
+    print(f"Генерация данных (масштаб {args.scale})...")
+    rows, elapsed = bulk_populate(conn, args.scale, args.batch_size, args.workers, args.seed,
+                                  args.journal_mode, args.synchronous)
+    conn.close()
+    print(f"Загружено {rows} строк за {elapsed:.2f} с ({rows / elapsed:.0f} строк/с)")
+
+
+if __name__ == "__main__":
+    main()
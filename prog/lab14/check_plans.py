@@ -0,0 +1,132 @@
+import argparse
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from library_db import INDEXES, REPORTS, create_indexes, create_statistics
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
+
+# Строка плана вида "SCAN bi" без "USING ... INDEX" означает полный просмотр таблицы
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+
+INDEX_NAME = re.compile(r'INDEX IF NOT EXISTS (\w+)')
+
+# Отчёты в прежнем виде, с группировкой всех выдач вместо сводных таблиц
+# и julianday() в условии по дате: с ними --no-indexes показывает исходные
+# планы и время для сравнения
+BASELINE_REPORTS = [
+    ("1. 5 самых популярных книг:", '''
+    SELECT b.title, b.author, COUNT(*) AS issue_count
+    FROM BookIssues bi
+    JOIN Books b ON bi.book_id = b.id
+    GROUP BY bi.book_id
+    ORDER BY issue_count DESC
+    LIMIT 5
+    '''),
+    ("2. Читатели с просроченными книгами:", '''
+    SELECT r.full_name, b.title, bi.issue_date
+    FROM BookIssues bi
+    JOIN Readers r ON bi.reader_id = r.id
+    JOIN Books b ON bi.book_id = b.id
+    WHERE bi.return_date IS NULL 
+    AND julianday('now') - julianday(bi.issue_date) > 30
+    '''),
+    ("3. Статистика по жанрам:", '''
+    SELECT b.genre, COUNT(DISTINCT b.id) AS book_count, COUNT(bi.id) AS issue_count
+    FROM Books b
+    LEFT JOIN BookIssues bi ON bi.book_id = b.id
+    GROUP BY b.genre
+    ORDER BY issue_count DESC
+    '''),
+    ("4. Самые активные читатели:", '''
+    SELECT r.full_name, r.membership_status, COUNT(*) AS books_issued
+    FROM BookIssues bi
+    JOIN Readers r ON bi.reader_id = r.id
+    GROUP BY bi.reader_id
+    ORDER BY books_issued DESC
+    LIMIT 5
+    '''),
+]
+
+
+def drop_indexes(conn):
+    for sql in INDEXES:
+        conn.execute(f'DROP INDEX IF EXISTS {INDEX_NAME.search(sql).group(1)}')
+
+
+def working_copy(database, directory):
+    # Проверка идёт на временной копии: индексы, сводные таблицы и ANALYZE
+    # меняют только её, исходный файл базы не изменяется
+    source = db.connect(database, readonly=True)
+    conn = db.connect(str(Path(directory) / 'check_plans.db'))
+    source.backup(conn)
+    source.close()
+    return conn
+
+
+def explain(conn, sql):
+    cursor = conn.execute('EXPLAIN QUERY PLAN ' + sql)
+    return [row[3] for row in cursor.fetchall()]
+
+
+def full_scans(plan):
+    return [line for line in plan if FULL_SCAN.match(line.strip())]
+
+
+def time_report(conn, sql):
+    start = time.perf_counter()
+    rows = conn.execute(sql).fetchall()
+    return time.perf_counter() - start, len(rows)
+
+
+def check_reports(conn, benchmark=False, reports=None):
+    failed = []
+    for title, sql, *_ in reports or REPORTS:
+        plan = explain(conn, sql)
+        scans = full_scans(plan)
+        status = "ПОЛНЫЙ ПРОСМОТР" if scans else "OK"
+        print(f"\n{title} {status}")
+        for line in plan:
+            print(f"    {line}")
+        if benchmark:
+            elapsed, rows = time_report(conn, sql)
+            print(f"    время: {elapsed * 1000:.1f} мс, строк: {rows}")
+        if scans:
+            failed.append(title)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка планов запросов для отчётов библиотеки")
+    parser.add_argument('--db', default='library.db', help='файл базы данных')
+    parser.add_argument('--benchmark', action='store_true', help='замерить время выполнения отчётов')
+    parser.add_argument('--no-indexes', action='store_true',
+                        help='проверить прежние отчёты с GROUP BY без индексов отчётов (для сравнения)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        conn = working_copy(args.db, directory)
+        if args.no_indexes:
+            drop_indexes(conn)
+            reports = BASELINE_REPORTS
+        else:
+            # В базе, созданной до появления индексов и сводных таблиц, они создаются в копии
+            create_indexes(conn)
+            create_statistics(conn)
+            reports = REPORTS
+        conn.execute('ANALYZE')
+        failed = check_reports(conn, args.benchmark, reports)
+        conn.close()
+
+    if failed:
+        print(f"\nОтчёты с полным просмотром таблиц: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nВсе отчёты используют индексы")
+
+
+if __name__ == "__main__":
+    main()
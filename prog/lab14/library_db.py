@@ -1,15 +1,22 @@
-import sqlite3
+import argparse
+import sys
+from pathlib import Path
 from faker import Faker
 from datetime import datetime, timedelta
 import random
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
+from common.reports import (CHUNK_SIZE, add_report_arguments, parse_report_arguments, report_output,
+                            run_report, status_stream)
+
 # Инициализация Faker
 fake = Faker('ru_RU')
 
 # Создание базы данных и таблиц
 
 def create_database_schema(db_name='library.db'):
-    conn = sqlite3.connect(db_name)
+    conn = db.connect(db_name)
     cursor = conn.cursor()
     
     # Создаем таблицу Книги
@@ -46,26 +53,191 @@ def create_database_schema(db_name='library.db'):
     )
     ''')
     
+    create_indexes(conn)
+    create_statistics(conn)
     conn.commit()
     return conn
 
+# Индексы для отчётов
+
+INDEXES = [
+    # Покрывающие индексы для группировки выдач по книгам и читателям
+    'CREATE INDEX IF NOT EXISTS idx_bookissues_book ON BookIssues (book_id)',
+    'CREATE INDEX IF NOT EXISTS idx_bookissues_reader ON BookIssues (reader_id)',
+    # Частичный индекс только по невозвращённым книгам
+    '''CREATE INDEX IF NOT EXISTS idx_bookissues_open
+    ON BookIssues (issue_date, reader_id, book_id)
+    WHERE return_date IS NULL''',
+    'CREATE INDEX IF NOT EXISTS idx_books_genre ON Books (genre)',
+]
+
+def create_indexes(conn):
+    cursor = conn.cursor()
+    for sql in INDEXES:
+        cursor.execute(sql)
+    conn.commit()
+
+# Сводные таблицы для отчётов, которые поддерживаются триггерами
+
+STATISTICS_TABLES = [
+    '''CREATE TABLE IF NOT EXISTS BookStats (
+        book_id INTEGER PRIMARY KEY,
+        issue_count INTEGER NOT NULL DEFAULT 0,
+        open_count INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (book_id) REFERENCES Books(id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS ReaderStats (
+        reader_id INTEGER PRIMARY KEY,
+        issue_count INTEGER NOT NULL DEFAULT 0,
+        open_count INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (reader_id) REFERENCES Readers(id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS GenreStats (
+        genre TEXT PRIMARY KEY,
+        book_count INTEGER NOT NULL DEFAULT 0,
+        issue_count INTEGER NOT NULL DEFAULT 0
+    )''',
+    # Отчёты берут первые k строк прямо из этих индексов
+    'CREATE INDEX IF NOT EXISTS idx_bookstats_issues ON BookStats (issue_count)',
+    'CREATE INDEX IF NOT EXISTS idx_readerstats_issues ON ReaderStats (issue_count)',
+    'CREATE INDEX IF NOT EXISTS idx_genrestats_issues ON GenreStats (issue_count)',
+]
+
+# Изменения счётчиков выдачи: для вставки знак +, для удаления -
+def _issue_delta(row, sign):
+    return f'''
+        UPDATE BookStats
+        SET issue_count = issue_count {sign} 1, open_count = open_count {sign} ({row}.return_date IS NULL)
+        WHERE book_id = {row}.book_id;
+        UPDATE ReaderStats
+        SET issue_count = issue_count {sign} 1, open_count = open_count {sign} ({row}.return_date IS NULL)
+        WHERE reader_id = {row}.reader_id;
+        UPDATE GenreStats SET issue_count = issue_count {sign} 1
+        WHERE genre = (SELECT genre FROM Books WHERE id = {row}.book_id);'''
+
+STATISTICS_TRIGGERS = {
+    'trg_books_insert': '''
+    CREATE TRIGGER IF NOT EXISTS trg_books_insert AFTER INSERT ON Books
+    BEGIN
+        INSERT INTO BookStats (book_id) VALUES (NEW.id);
+        INSERT INTO GenreStats (genre, book_count) VALUES (NEW.genre, 1)
+        ON CONFLICT (genre) DO UPDATE SET book_count = book_count + 1;
+    END''',
+    'trg_books_delete': '''
+    CREATE TRIGGER IF NOT EXISTS trg_books_delete AFTER DELETE ON Books
+    BEGIN
+        UPDATE GenreStats
+        SET book_count = book_count - 1,
+            issue_count = issue_count - (SELECT issue_count FROM BookStats WHERE book_id = OLD.id)
+        WHERE genre = OLD.genre;
+        DELETE FROM BookStats WHERE book_id = OLD.id;
+    END''',
+    'trg_books_genre': '''
+    CREATE TRIGGER IF NOT EXISTS trg_books_genre AFTER UPDATE OF genre ON Books
+    BEGIN
+        UPDATE GenreStats
+        SET book_count = book_count - 1,
+            issue_count = issue_count - (SELECT issue_count FROM BookStats WHERE book_id = OLD.id)
+        WHERE genre = OLD.genre;
+        INSERT INTO GenreStats (genre, book_count, issue_count)
+        VALUES (NEW.genre, 1, (SELECT issue_count FROM BookStats WHERE book_id = NEW.id))
+        ON CONFLICT (genre) DO UPDATE
+        SET book_count = book_count + 1, issue_count = issue_count + excluded.issue_count;
+    END''',
+    'trg_readers_insert': '''
+    CREATE TRIGGER IF NOT EXISTS trg_readers_insert AFTER INSERT ON Readers
+    BEGIN
+        INSERT INTO ReaderStats (reader_id) VALUES (NEW.id);
+    END''',
+    'trg_readers_delete': '''
+    CREATE TRIGGER IF NOT EXISTS trg_readers_delete AFTER DELETE ON Readers
+    BEGIN
+        DELETE FROM ReaderStats WHERE reader_id = OLD.id;
+    END''',
+    'trg_issues_insert': f'''
+    CREATE TRIGGER IF NOT EXISTS trg_issues_insert AFTER INSERT ON BookIssues
+    BEGIN{_issue_delta('NEW', '+')}
+    END''',
+    # Возврат книги и любое другое изменение выдачи: снимаем старую запись и учитываем новую
+    'trg_issues_update': f'''
+    CREATE TRIGGER IF NOT EXISTS trg_issues_update AFTER UPDATE ON BookIssues
+    BEGIN{_issue_delta('OLD', '-')}{_issue_delta('NEW', '+')}
+    END''',
+    'trg_issues_delete': f'''
+    CREATE TRIGGER IF NOT EXISTS trg_issues_delete AFTER DELETE ON BookIssues
+    BEGIN{_issue_delta('OLD', '-')}
+    END''',
+}
+
+def create_statistics(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'BookStats'")
+    existed = cursor.fetchone() is not None
+    for sql in STATISTICS_TABLES:
+        cursor.execute(sql)
+    create_statistics_triggers(conn)
+    # Для уже заполненной базы сводные таблицы один раз считаются целиком
+    if not existed:
+        rebuild_statistics(conn)
+    conn.commit()
+
+def create_statistics_triggers(conn):
+    cursor = conn.cursor()
+    for sql in STATISTICS_TRIGGERS.values():
+        cursor.execute(sql)
+
+def drop_statistics_triggers(conn):
+    # При массовой загрузке триггеры снимаются, а сводки пересчитываются в конце
+    cursor = conn.cursor()
+    for name in STATISTICS_TRIGGERS:
+        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+def rebuild_statistics(conn):
+    # В LEFT JOIN у книги или читателя без выдач return_date тоже NULL,
+    # поэтому открытой считается только реально существующая выдача
+    cursor = conn.cursor()
+    cursor.execute('DELETE FROM BookStats')
+    cursor.execute('DELETE FROM ReaderStats')
+    cursor.execute('DELETE FROM GenreStats')
+    cursor.execute('''
+    INSERT INTO BookStats (book_id, issue_count, open_count)
+    SELECT b.id, COUNT(bi.id), SUM(bi.id IS NOT NULL AND bi.return_date IS NULL)
+    FROM Books b
+    LEFT JOIN BookIssues bi ON bi.book_id = b.id
+    GROUP BY b.id
+    ''')
+    cursor.execute('''
+    INSERT INTO ReaderStats (reader_id, issue_count, open_count)
+    SELECT r.id, COUNT(bi.id), SUM(bi.id IS NOT NULL AND bi.return_date IS NULL)
+    FROM Readers r
+    LEFT JOIN BookIssues bi ON bi.reader_id = r.id
+    GROUP BY r.id
+    ''')
+    cursor.execute('''
+    INSERT INTO GenreStats (genre, book_count, issue_count)
+    SELECT b.genre, COUNT(*), SUM(s.issue_count)
+    FROM Books b
+    JOIN BookStats s ON s.book_id = b.id
+    GROUP BY b.genre
+    ''')
+
 # Генерация тестовых данных
 
+# Списки для генерации данных
+GENRES = [
+    'Роман', 'Детектив', 'Фантастика', 'Фэнтези', 'Исторический',
+    'Биография', 'Научная литература', 'Поэзия', 'Драма', 'Учебник'
+]
+STATUSES = ['Активен', 'Приостановлен', 'Просрочен', 'Новый']
+
 def generate_fake_data():
-    # Списки для генерации данных
-    genres = [
-        'Роман', 'Детектив', 'Фантастика', 'Фэнтези', 'Исторический',
-        'Биография', 'Научная литература', 'Поэзия', 'Драма', 'Учебник'
-    ]
-    statuses = ['Активен', 'Приостановлен', 'Просрочен', 'Новый']
-    
     # Генерация книг
     books = []
     for _ in range(100):
         books.append({
             'title': fake.catch_phrase(),
             'author': fake.name(),
-            'genre': random.choice(genres),
+            'genre': random.choice(GENRES),
             'year': random.randint(1950, 2023)
         })
     
@@ -75,7 +247,7 @@ def generate_fake_data():
         readers.append({
             'full_name': fake.name(),
             'contact': fake.email(),
-            'membership_status': random.choice(statuses)
+            'membership_status': random.choice(STATUSES)
         })
     
     return books, readers
@@ -118,82 +290,73 @@ def populate_database(conn, books, readers):
 
 # SQL-запросы к базе данных
 
-def execute_queries(conn):
-    cursor = conn.cursor()
-    
-    print("\n1. 5 самых популярных книг:")
-    cursor.execute('''
-    SELECT b.title, b.author, COUNT(*) AS issue_count
-    FROM BookIssues bi
-    JOIN Books b ON bi.book_id = b.id
-    GROUP BY b.id
-    ORDER BY issue_count DESC
+# Отчёт: заголовок, запрос, названия столбцов и их ширина при выводе
+REPORTS = [
+    ("1. 5 самых популярных книг:", '''
+    SELECT b.title, b.author, s.issue_count
+    FROM BookStats s
+    JOIN Books b ON s.book_id = b.id
+    ORDER BY s.issue_count DESC
     LIMIT 5
-    ''')
-    print("{:<40} {:<25} {:<10}".format("Название", "Автор", "Выдач"))
-    for row in cursor.fetchall():
-        print("{:<40} {:<25} {:<10}".format(row[0], row[1], row[2]))
-    
-    print("\n2. Читатели с просроченными книгами:")
-    cursor.execute('''
+    ''', ("Название", "Автор", "Выдач"), (40, 25, 10)),
+    # Условие по дате записано без julianday(), чтобы работал индекс idx_bookissues_open
+    ("2. Читатели с просроченными книгами:", '''
     SELECT r.full_name, b.title, bi.issue_date
     FROM BookIssues bi
     JOIN Readers r ON bi.reader_id = r.id
     JOIN Books b ON bi.book_id = b.id
     WHERE bi.return_date IS NULL 
-    AND julianday('now') - julianday(bi.issue_date) > 30
-    ''')
-    print("{:<30} {:<40} {:<15}".format("Читатель", "Книга", "Дата выдачи"))
-    for row in cursor.fetchall():
-        print("{:<30} {:<40} {:<15}".format(row[0], row[1], row[2]))
-    
-    print("\n3. Статистика по жанрам:")
-    cursor.execute('''
-    SELECT genre, COUNT(*) AS book_count, 
-    (SELECT COUNT(*) FROM BookIssues bi WHERE bi.book_id = b.id) AS issue_count
-    FROM Books b
-    GROUP BY genre
+    AND bi.issue_date < datetime('now', '-30 days')
+    ''', ("Читатель", "Книга", "Дата выдачи"), (30, 40, 15)),
+    ("3. Статистика по жанрам:", '''
+    SELECT genre, book_count, issue_count
+    FROM GenreStats
     ORDER BY issue_count DESC
-    ''')
-    print("{:<20} {:<15} {:<15}".format("Жанр", "Книг", "Выдач"))
-    for row in cursor.fetchall():
-        print("{:<20} {:<15} {:<15}".format(row[0], row[1], row[2]))
-    
-    print("\n4. Самые активные читатели:")
-    cursor.execute('''
-    SELECT r.full_name, r.membership_status, COUNT(*) AS books_issued
-    FROM BookIssues bi
-    JOIN Readers r ON bi.reader_id = r.id
-    GROUP BY r.id
-    ORDER BY books_issued DESC
+    ''', ("Жанр", "Книг", "Выдач"), (20, 15, 15)),
+    ("4. Самые активные читатели:", '''
+    SELECT r.full_name, r.membership_status, s.issue_count
+    FROM ReaderStats s
+    JOIN Readers r ON s.reader_id = r.id
+    ORDER BY s.issue_count DESC
     LIMIT 5
-    ''')
-    print("{:<30} {:<15} {:<15}".format("Читатель", "Статус", "Книг выдано"))
-    for row in cursor.fetchall():
-        print("{:<30} {:<15} {:<15}".format(row[0], row[1], row[2]))
+    ''', ("Читатель", "Статус", "Книг выдано"), (30, 15, 15)),
+]
+
+def execute_queries(conn, fmt='table', output=None, chunk_size=CHUNK_SIZE):
+    cursor = conn.cursor()
+    
+    with report_output(fmt, output) as out_for:
+        for title, sql, columns, widths in REPORTS:
+            run_report(cursor, title, sql, fmt=fmt, out=out_for(title), columns=columns,
+                       widths=widths, chunk_size=chunk_size)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="База данных библиотеки")
+    add_report_arguments(parser)
+    args = parse_report_arguments(parser)
+    log = status_stream(args)
+
     # Создаем БД
-    print("Создание базы данных...")
+    print("Создание базы данных...", file=log)
     conn = create_database_schema()
     
     # Генерируем данные
-    print("Генерация тестовых данных...")
+    print("Генерация тестовых данных...", file=log)
     books, readers = generate_fake_data()
     
     # Заполняем БД
-    print("Заполнение базы данных...")
+    print("Заполнение базы данных...", file=log)
     populate_database(conn, books, readers)
     
     # Выполняем запросы
-    print("\nВыполнение запросов...")
-    execute_queries(conn)
+    print("\nВыполнение запросов...", file=log)
+    execute_queries(conn, args.format, args.output, args.chunk_size)
     
     # Закрываем соединение
     conn.close()
-    print("\nГотово! База данных сохранена в файле 'library.db'")
-    print("Для просмотра данных используйте DB Browser for SQLite")
+    print("\nГотово! База данных сохранена в файле 'library.db'", file=log)
+    print("Для просмотра данных используйте DB Browser for SQLite", file=log)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
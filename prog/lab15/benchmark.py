@@ -0,0 +1,77 @@
+import argparse
+import gc
+import random
+import re
+import time
+
+from row_parser import parse_rows
+
+CONSTELLATIONS = ['Рыбы', 'Кит', 'Лев', 'Дракон', 'Южная Гидра', 'Большая Медведица']
+
+
+# Синтетическая таблица: ячейки в том виде, в каком их отдают бэкенды разбора HTML
+def synthetic_table(count, seed=0):
+    rnd = random.Random(seed)
+    return [
+        [f"HD {i}", rnd.choice(CONSTELLATIONS), f"{rnd.uniform(4, 3000):.1f}[{rnd.randint(1, 9)}]",
+         f"{rnd.choice('OBAFGKM')}{rnd.randint(0, 9)} V", "1,2", "—",
+         f"{rnd.randint(1, 8)} (1 неподтв.)"]
+        for i in range(count)
+    ]
+
+
+# Прежний разбор строк из parse_wikipedia_data: некомпилированные шаблоны и словари
+def parse_rows_old(rows):
+    data = []
+    for cols in rows:
+        if len(cols) < 7:
+            continue
+        distance = None
+        try:
+            distance_str = re.sub(r'[^\d.]', '', cols[2].replace(',', '.'))
+            if distance_str:
+                distance = float(distance_str)
+        except (ValueError, TypeError):
+            distance = None
+        planets_match = re.search(r'\d+', cols[-1])
+        data.append({
+            'star': cols[0],
+            'constellation': cols[1],
+            'distance': distance,
+            'spectral_class': cols[3].split()[0],
+            'planets': int(planets_match.group()) if planets_match else 0
+        })
+    return data
+
+
+# Лучшее время из нескольких прогонов; как и timeit, сборщик мусора
+# на время замера отключается, иначе на миллионах новых объектов
+# время зависит от того, на какой прогон пришлась полная сборка
+def measure(parse, rows, repeat):
+    best = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse(rows)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость разбора строк таблицы кратных систем")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = synthetic_table(args.count)
+    old = measure(parse_rows_old, rows, args.repeat)
+    new = measure(lambda table: list(parse_rows(table)), rows, args.repeat)
+    print(f"Прежний разбор: {old:.2f} с ({args.count / old:.0f} строк/с)")
+    print(f"row_parser:     {new:.2f} с ({args.count / new:.0f} строк/с), ускорение {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
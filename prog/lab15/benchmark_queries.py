@@ -0,0 +1,92 @@
+import argparse
+import random
+import time
+from pathlib import Path
+
+from exoplanets import create_database_schema, populate_database, report_queries
+from row_parser import StarRow
+
+# Прежние запросы: полная сортировка stars и «голый» столбец при MAX()
+OLD_QUERIES = {
+    "Топ ближайших": '''
+    SELECT s.name, c.name, s.distance FROM stars s
+    JOIN constellations c ON s.constellation_id = c.id
+    WHERE s.distance IS NOT NULL ORDER BY s.distance ASC LIMIT :top_n
+    ''',
+    "Топ далеких": '''
+    SELECT s.name, c.name, s.distance FROM stars s
+    JOIN constellations c ON s.constellation_id = c.id
+    WHERE s.distance IS NOT NULL ORDER BY s.distance DESC LIMIT :top_n
+    ''',
+    "Топ по планетам": '''
+    SELECT s.name, c.name, s.planets_count FROM stars s
+    JOIN constellations c ON s.constellation_id = c.id
+    ORDER BY s.planets_count DESC LIMIT :top_n
+    ''',
+    "Богатейшие по созвездиям": '''
+    SELECT c.name, s.name, MAX(s.planets_count) FROM stars s
+    JOIN constellations c ON s.constellation_id = c.id
+    GROUP BY c.id
+    ''',
+}
+
+NEW_INDEXES = ['idx_stars_distance', 'idx_stars_planets', 'idx_stars_constellation_planets']
+
+
+def synthetic_stars(count, constellations=88, seed=0):
+    rnd = random.Random(seed)
+    for i in range(count):
+        distance = rnd.uniform(4, 3000) if rnd.random() > 0.05 else None
+        yield StarRow(f"HD {i}", f"Созвездие {rnd.randrange(constellations)}", distance,
+                      rnd.choice("OBAFGKM"), rnd.randint(1, 8))
+
+
+def timed(cursor, sql, params, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(sql, params).fetchall()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Запросы «первые N» на большой таблице звёзд")
+    parser.add_argument("--db", default="benchmark_stars.db")
+    parser.add_argument("--stars", type=int, default=1_000_000)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if Path(args.db).exists():
+        Path(args.db).unlink()
+    conn = create_database_schema(args.db)
+    start = time.perf_counter()
+    populate_database(conn, list(synthetic_stars(args.stars)))
+    conn.execute("ANALYZE")
+    print(f"Загружено {args.stars} звёзд за {time.perf_counter() - start:.1f} с")
+    cursor = conn.cursor()
+    params = {"top_n": args.top}
+
+    # Без новых индексов: так работали запросы до изменений
+    for index in NEW_INDEXES:
+        cursor.execute(f"DROP INDEX {index}")
+    old = [timed(cursor, sql, params, args.repeat) for sql in OLD_QUERIES.values()]
+    conn.close()
+
+    conn = create_database_schema(args.db)
+    conn.execute("ANALYZE")
+    cursor = conn.cursor()
+    new = [timed(cursor, sql, {"top_n": top}, args.repeat)
+           for _, sql, top, _, _ in report_queries(args.top)]
+    window = timed(cursor, report_queries(args.top, strategy="window")[-1][1], {"top_n": 1}, args.repeat)
+    conn.close()
+
+    print(f"{'Запрос':<28}{'было, мс':>12}{'стало, мс':>12}")
+    for name, before, after in zip(OLD_QUERIES, old, new):
+        print(f"{name:<28}{before * 1000:>12.2f}{after * 1000:>12.2f}")
+    print(f"Богатейшие через ROW_NUMBER(): {window * 1000:.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
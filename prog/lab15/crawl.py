@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from exoplanets import (WIKI_URL, create_database_schema, make_dimensions, parse_wikipedia_data,
+                        populate_database)
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
+from common.crawler import Crawler
+
+
+# Каждая страница со списком систем разбирается отдельно, строки сразу уходят в БД
+def parse_page(url, html):
+    return parse_wikipedia_data(html), []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Асинхронная загрузка страниц со списками планетных систем")
+    parser.add_argument('urls', nargs='*', default=[WIKI_URL],
+                        help='адреса страниц (можно указать локальный сервер с сохранёнными страницами)')
+    parser.add_argument('--db', default='exoplanets.db')
+    parser.add_argument('--concurrency', type=int, default=4, help='одновременных запросов')
+    parser.add_argument('--rate', type=float, default=2.0, help='запросов в секунду к одному хосту')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--state', default='crawl_state.jsonl',
+                        help='журнал прогресса для продолжения прерванной загрузки')
+    args = parser.parse_args()
+
+    conn = create_database_schema(args.db)
+    conn.close()
+    # Запись идёт из отдельного потока обходчика
+    conn = db.connect(args.db, check_same_thread=False)
+    try:
+        crawler = Crawler(args.concurrency, args.rate, args.retries, state_file=args.state)
+        # Кэш ключей справочников общий для всех страниц
+        dimensions = make_dimensions()
+        stats = asyncio.run(crawler.run(args.urls, parse_page,
+                                        lambda rows: populate_database(conn, rows, dimensions)))
+    finally:
+        conn.close()
+    print(f"Страниц: {stats['pages']}, звёзд: {stats['rows']}, ошибок: {stats['errors']}")
+
+
+if __name__ == "__main__":
+    main()
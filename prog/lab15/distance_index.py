@@ -0,0 +1,179 @@
+import argparse
+import heapq
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
+
+# Индексы для запросов по расстоянию, которые строятся один раз из БД
+# и дальше отвечают из памяти без обращений к SQLite
+
+
+# Отсортированные расстояния: диапазон ищется двумя бинарными поисками,
+# k ближайших к заданному расстоянию — расширением от точки вставки
+class DistanceIndex:
+    def __init__(self, distances, ids):
+        self.distances = distances
+        self.ids = ids
+
+    @classmethod
+    def from_db(cls, conn):
+        # Строки приходят уже упорядоченными по индексу idx_stars_distance
+        distances = array('d')
+        ids = array('q')
+        for star_id, distance in conn.execute('''
+        SELECT id, distance FROM stars
+        WHERE distance IS NOT NULL
+        ORDER BY distance
+        '''):
+            ids.append(star_id)
+            distances.append(distance)
+        return cls(distances, ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def between(self, low, high):
+        # Системы на расстоянии от low до high включительно: [(id, расстояние)]
+        start = bisect_left(self.distances, low)
+        end = bisect_right(self.distances, high)
+        return list(zip(self.ids[start:end], self.distances[start:end]))
+
+    def nearest(self, distance, k=1):
+        # k систем, чьё расстояние ближе всего к заданному
+        right = bisect_left(self.distances, distance)
+        left = right - 1
+        result = []
+        while len(result) < k and (left >= 0 or right < len(self.distances)):
+            if right >= len(self.distances) or (
+                    left >= 0 and distance - self.distances[left] <= self.distances[right] - distance):
+                result.append((self.ids[left], self.distances[left]))
+                left -= 1
+            else:
+                result.append((self.ids[right], self.distances[right]))
+                right += 1
+        return result
+
+
+# Прямое восхождение и склонение в градусах плюс расстояние -> x, y, z
+def to_cartesian(ra, dec, distance):
+    ra, dec = math.radians(ra), math.radians(dec)
+    return (distance * math.cos(dec) * math.cos(ra),
+            distance * math.cos(dec) * math.sin(ra),
+            distance * math.sin(dec))
+
+
+# KD-дерево по трёхмерным координатам звёзд для поиска ближайших соседей.
+# Узлы хранятся в массивах: points[i] — точка, left[i]/right[i] — потомки
+class KDTree:
+    def __init__(self, points, ids):
+        self.points = []
+        self.ids = []
+        self.axes = []
+        self.left = []
+        self.right = []
+        self.root = self._build(list(zip(points, ids)), 0)
+
+    def _build(self, items, depth):
+        if not items:
+            return -1
+        axis = depth % 3
+        items.sort(key=lambda item: item[0][axis])
+        median = len(items) // 2
+        node = len(self.points)
+        point, star_id = items[median]
+        self.points.append(point)
+        self.ids.append(star_id)
+        self.axes.append(axis)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.left[node] = self._build(items[:median], depth + 1)
+        self.right[node] = self._build(items[median + 1:], depth + 1)
+        return node
+
+    def __len__(self):
+        return len(self.points)
+
+    def nearest(self, point, k=1):
+        # Возвращает [(id, расстояние до point)] по возрастанию расстояния
+        x, y, z = point
+        heap = []  # max-куча из k лучших: (-квадрат расстояния, id)
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+            candidate = self.points[node]
+            dx = candidate[0] - x
+            dy = candidate[1] - y
+            dz = candidate[2] - z
+            squared = dx * dx + dy * dy + dz * dz
+            if len(heap) < k:
+                heapq.heappush(heap, (-squared, self.ids[node]))
+            elif squared < -heap[0][0]:
+                heapq.heapreplace(heap, (-squared, self.ids[node]))
+            axis = self.axes[node]
+            diff = point[axis] - candidate[axis]
+            near, far = (self.left[node], self.right[node]) if diff < 0 else (self.right[node], self.left[node])
+            # Дальнее поддерево проверяется, только если разделяющая
+            # плоскость ближе текущего k-го соседа
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                stack.append(far)
+            stack.append(near)
+        return [(star_id, math.sqrt(-squared)) for squared, star_id in sorted(heap, reverse=True)]
+
+
+def describe(conn, found):
+    # Имена и созвездия для найденных id в порядке результата
+    names = {}
+    ids = [star_id for star_id, _ in found]
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        names.update((row[0], row[1:]) for row in conn.execute(f'''
+        SELECT s.id, s.name, c.name
+        FROM stars s
+        JOIN constellations c ON s.constellation_id = c.id
+        WHERE s.id IN ({', '.join('?' * len(chunk))})
+        ''', chunk))
+    return [(*names[star_id], distance) for star_id, distance in found]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Поиск систем по расстоянию")
+    parser.add_argument('--db', default='exoplanets.db')
+    parser.add_argument('--between', nargs=2, type=float, metavar=('ОТ', 'ДО'),
+                        help='системы в диапазоне расстояний, св. лет')
+    parser.add_argument('--nearest', type=float, metavar='РАССТОЯНИЕ',
+                        help='системы с расстоянием, ближайшим к заданному')
+    parser.add_argument('-k', type=int, default=5, help='сколько систем искать для --nearest')
+    args = parser.parse_args()
+
+    conn = db.connect(args.db, readonly=True)
+    start = time.perf_counter()
+    index = DistanceIndex.from_db(conn)
+    print(f"Индекс по {len(index)} системам построен за {(time.perf_counter() - start) * 1000:.1f} мс")
+
+    queries = []
+    if args.between:
+        low, high = args.between
+        queries.append((f"Системы от {low} до {high} св. лет:", lambda: index.between(low, high)))
+    if args.nearest is not None:
+        queries.append((f"{args.k} систем с расстоянием около {args.nearest} св. лет:",
+                        lambda: index.nearest(args.nearest, args.k)))
+    for title, query in queries:
+        start = time.perf_counter()
+        found = query()
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"\n{title} ({len(found)}, {elapsed:.3f} мс)")
+        for star, constellation, distance in describe(conn, found):
+            print(f"{star} ({constellation}): {distance} св. лет")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
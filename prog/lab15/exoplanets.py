@@ -1,63 +1,80 @@
-import sqlite3
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+from bs4 import BeautifulSoup, SoupStrainer
 import re
+from datetime import datetime, timezone
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
+from common.dimensions import DimensionTable
+from common.http_cache import HttpCache
+from common.reports import (CHUNK_SIZE, add_report_arguments, parse_report_arguments, report_output,
+                            run_report, status_stream)
+from common.topn import top_n_sql
+from row_parser import parse_rows
 
 # ----------------------------
 # ШАГ 1: Парсинг данных с Википедии
 # ----------------------------
 
-def parse_wikipedia_data():
-    url = "https://ru.wikipedia.org/wiki/Список_кратных_планетных_систем"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    table = soup.find('table', {'class': 'wikitable'})
-    data = []
-    
+WIKI_URL = "https://ru.wikipedia.org/wiki/Список_кратных_планетных_систем"
+CACHE_DIR = Path(__file__).resolve().parent / '.http_cache'
+
+# Бэкенды разбора: каждый возвращает строки таблицы wikitable как списки
+# текстов ячеек (аналог get_text(strip=True)), заголовок пропускается
+
+def _cell_text(fragments):
+    return ''.join(fragment.strip() for fragment in fragments)
+
+def rows_lxml(html):
+    # Прямой разбор через lxml без построения дерева BeautifulSoup
+    import lxml.html
+    root = lxml.html.fromstring(html)
+    tables = root.xpath("//table[contains(concat(' ', normalize-space(@class), ' '), ' wikitable ')]")
+    if not tables:
+        return
+    for row in list(tables[0].iter('tr'))[1:]:
+        yield [_cell_text(td.itertext()) for td in row.iter('td')]
+
+def rows_soup(html, parser='html.parser'):
+    # Разбираем только таблицу wikitable, остальная страница пропускается
+    only_table = SoupStrainer('table', class_=re.compile(r'\bwikitable\b'))
+    table = BeautifulSoup(html, parser, parse_only=only_table).find('table')
+    if table is None:
+        return
     for row in table.find_all('tr')[1:]:
-        cols = row.find_all('td')
-        if len(cols) < 7:
-            continue
-        
-        star_name = cols[0].get_text(strip=True)
-        constellation = cols[1].get_text(strip=True)
-        
-        # Обработка расстояния
-        # Обработка расстояния (с обработкой ошибок)
-        distance = None
-        try:
-            distance_str = re.sub(r'[^\d.]', '', cols[2].get_text(strip=True).replace(',', '.'))
-            if distance_str:
-                distance = float(distance_str)
-        except (ValueError, TypeError):
-            distance = None
-        
-        # Обработка спектрального класса
-        spectral_class = cols[3].get_text(strip=True).split()[0]
-        
-        # Обработка количества планет (исправление)
-        planets_text = cols[-1].get_text(strip=True)
-        # Извлекаем первое число из текста (игнорируем примечания в скобках)
-        planets_match = re.search(r'\d+', planets_text)
-        planets = int(planets_match.group()) if planets_match else 0
-        
-        data.append({
-            'star': star_name,
-            'constellation': constellation,
-            'distance': distance,
-            'spectral_class': spectral_class,
-            'planets': planets
-        })
-    
-    return data
+        yield [td.get_text(strip=True) for td in row.find_all('td')]
+
+PARSERS = {
+    'lxml': rows_lxml,
+    'html.parser': rows_soup,
+}
+
+def default_parser():
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+def fetch_page(url=WIKI_URL, cache_dir=CACHE_DIR, offline=False):
+    return HttpCache(cache_dir, offline=offline).get(url)
+
+def parse_wikipedia_data(html=None, parser=None, offline=False, cache_dir=CACHE_DIR):
+    if html is None:
+        html = fetch_page(cache_dir=cache_dir, offline=offline)
+    # Строки разбираются в кортежи StarRow (star, constellation, distance,
+    # spectral_class, planets), см. row_parser
+    return list(parse_rows(PARSERS[parser or default_parser()](html)))
 
 # ----------------------------
 # ШАГ 2: Создание БД и таблиц
 # ----------------------------
 
 def create_database_schema(db_name='exoplanets.db'):
-    conn = sqlite3.connect(db_name)
+    conn = db.connect(db_name)
     cursor = conn.cursor()
     
     # Создаем таблицу созвездий
@@ -85,133 +102,267 @@ def create_database_schema(db_name='exoplanets.db'):
         spectral_class_id INTEGER NOT NULL,
         distance REAL,
         planets_count INTEGER NOT NULL,
+        row_hash TEXT,
         FOREIGN KEY (constellation_id) REFERENCES constellations(id),
         FOREIGN KEY (spectral_class_id) REFERENCES spectral_classes(id)
     )
     ''')
+    migrate_stars(conn)
+    
+    # Индексы для запросов «первые N»: ORDER BY ... LIMIT читает начало
+    # индекса, а самые богатые системы ищутся отдельно в каждом созвездии
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stars_distance ON stars(distance)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_stars_planets ON stars(planets_count)')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_stars_constellation_planets
+    ON stars(constellation_id, planets_count DESC)
+    ''')
+    
+    # Журнал загрузок: сколько строк изменил каждый запуск
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ingest_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source TEXT,
+        started_at TEXT NOT NULL,
+        finished_at TEXT NOT NULL,
+        rows_parsed INTEGER NOT NULL,
+        inserted INTEGER NOT NULL,
+        updated INTEGER NOT NULL,
+        deleted INTEGER NOT NULL,
+        unchanged INTEGER NOT NULL
+    )
+    ''')
     
     conn.commit()
     return conn
 
+# Приведение старых баз: раньше каждый запуск дописывал все звёзды заново,
+# поэтому оставляем последнюю запись каждой звезды и делаем имя уникальным
+def migrate_stars(conn):
+    cursor = conn.cursor()
+    columns = {row[1] for row in cursor.execute('PRAGMA table_info(stars)')}
+    if 'row_hash' not in columns:
+        cursor.execute('ALTER TABLE stars ADD COLUMN row_hash TEXT')
+    cursor.execute('''
+    SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_stars_name'
+    ''')
+    if cursor.fetchone() is None:
+        cursor.execute('''
+        DELETE FROM stars
+        WHERE id NOT IN (SELECT MAX(id) FROM stars GROUP BY name)
+        ''')
+        cursor.execute('CREATE UNIQUE INDEX idx_stars_name ON stars(name)')
+
 # ----------------------------
 # ШАГ 3: Заполнение БД данными
 # ----------------------------
 
-def populate_database(conn, data):
+# Справочники созвездий и спектральных классов. Кэш ключей живёт
+# вместе с объектами, поэтому при повторной загрузке в ту же базу
+# (например, из краулера) известные значения в БД не запрашиваются
+def make_dimensions():
+    return {
+        'constellation': DimensionTable('constellations', 'name'),
+        'spectral_class': DimensionTable('spectral_classes', 'class'),
+    }
+
+# Хэш содержимого строки: по нему видно, изменилась ли звезда с прошлой загрузки
+def row_hash(item):
+    key = '\x1f'.join(map(repr, item))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def resolve_keys(cursor, data, dimensions):
+    # Ключи справочников: один пакетный upsert на каждые 500 новых значений
+    return (dimensions['constellation'].resolve(cursor, [item.constellation for item in data]),
+            dimensions['spectral_class'].resolve(cursor, [item.spectral_class for item in data]))
+
+def star_rows(data, constellation_ids, spectral_class_ids):
+    for item in data:
+        yield (
+            constellation_ids[item.constellation],
+            spectral_class_ids[item.spectral_class],
+            item.distance,
+            item.planets,
+            row_hash(item),
+            item.star
+        )
+
+# Дозапись звёзд без удаления отсутствующих (краулер грузит страницы по одной);
+# повторная загрузка той же звезды обновляет её, а не дублирует
+def populate_database(conn, data, dimensions=None):
+    if dimensions is None:
+        dimensions = make_dimensions()
     cursor = conn.cursor()
     
-    # Собираем уникальные значения
-    constellations = {item['constellation'] for item in data}
-    spectral_classes = {item['spectral_class'] for item in data}
-    
-    # Заполняем созвездия
-    constellation_ids = {}
-    for name in constellations:
-        cursor.execute('INSERT OR IGNORE INTO constellations (name) VALUES (?)', (name,))
-        cursor.execute('SELECT id FROM constellations WHERE name = ?', (name,))
-        constellation_ids[name] = cursor.fetchone()[0]
-    
-    # Заполняем спектральные классы
-    spectral_class_ids = {}
-    for class_name in spectral_classes:
-        cursor.execute('INSERT OR IGNORE INTO spectral_classes (class) VALUES (?)', (class_name,))
-        cursor.execute('SELECT id FROM spectral_classes WHERE class = ?', (class_name,))
-        spectral_class_ids[class_name] = cursor.fetchone()[0]
-    
-    # Заполняем звезды
-    for item in data:
-        cursor.execute('''
-        INSERT INTO stars (name, constellation_id, spectral_class_id, distance, planets_count)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (
-            item['star'],
-            constellation_ids[item['constellation']],
-            spectral_class_ids[item['spectral_class']],
-            item['distance'],
-            item['planets']
-        ))
+    try:
+        constellation_ids, spectral_class_ids = resolve_keys(cursor, data, dimensions)
+        
+        # Заполняем звезды одним executemany
+        cursor.executemany('''
+        INSERT INTO stars (constellation_id, spectral_class_id, distance, planets_count, row_hash, name)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            constellation_id = excluded.constellation_id,
+            spectral_class_id = excluded.spectral_class_id,
+            distance = excluded.distance,
+            planets_count = excluded.planets_count,
+            row_hash = excluded.row_hash
+        WHERE row_hash IS NOT excluded.row_hash
+        ''', star_rows(data, constellation_ids, spectral_class_ids))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        for table in dimensions.values():
+            table.clear()
+        raise
+
+# Инкрементальная синхронизация с полным снимком страницы: вставляются
+# новые звёзды, обновляются только изменившиеся, исчезнувшие удаляются
+# Доля звёзд, которую синхронизация может удалить за один запуск. Пустой
+# снимок или пропажа большей части звёзд скорее означают, что страница
+# пустая или изменила разметку, а не что звёзды исчезли из списка
+MAX_DELETE_SHARE = 0.5
+
+def sync_database(conn, data, dimensions=None, source=WIKI_URL, max_delete_share=MAX_DELETE_SHARE):
+    if dimensions is None:
+        dimensions = make_dimensions()
+    cursor = conn.cursor()
+    started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
     
-    conn.commit()
+    # При повторе имени в источнике остаётся последняя строка
+    parsed = {item.star: item for item in data}
+    existing = dict(cursor.execute('SELECT name, row_hash FROM stars'))
+    
+    inserted = [item for name, item in parsed.items() if name not in existing]
+    updated = [item for name, item in parsed.items()
+               if name in existing and existing[name] != row_hash(item)]
+    deleted = [(name,) for name in existing if name not in parsed]
+    unchanged = len(parsed) - len(inserted) - len(updated)
+    
+    if existing and (not parsed or len(deleted) > max_delete_share * len(existing)):
+        raise RuntimeError(
+            f"Синхронизация отменена: из {len(existing)} звёзд в базе удалилось бы {len(deleted)}, "
+            f"в источнике разобрано {len(parsed)} строк. Проверьте страницу и разбор таблицы"
+        )
+    
+    try:
+        constellation_ids, spectral_class_ids = resolve_keys(cursor, inserted + updated, dimensions)
+        cursor.executemany('''
+        INSERT INTO stars (constellation_id, spectral_class_id, distance, planets_count, row_hash, name)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', star_rows(inserted, constellation_ids, spectral_class_ids))
+        cursor.executemany('''
+        UPDATE stars
+        SET constellation_id = ?, spectral_class_id = ?, distance = ?, planets_count = ?, row_hash = ?
+        WHERE name = ?
+        ''', star_rows(updated, constellation_ids, spectral_class_ids))
+        cursor.executemany('DELETE FROM stars WHERE name = ?', deleted)
+        
+        stats = {
+            'rows_parsed': len(data),
+            'inserted': len(inserted),
+            'updated': len(updated),
+            'deleted': len(deleted),
+            'unchanged': unchanged,
+        }
+        cursor.execute('''
+        INSERT INTO ingest_log (source, started_at, finished_at, rows_parsed, inserted, updated, deleted, unchanged)
+        VALUES (:source, :started_at, :finished_at, :rows_parsed, :inserted, :updated, :deleted, :unchanged)
+        ''', dict(stats, source=source, started_at=started_at,
+                  finished_at=datetime.now(timezone.utc).isoformat(timespec='seconds')))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        for table in dimensions.values():
+            table.clear()
+        raise
+    return stats
 
 # ----------------------------
 # ШАГ 4: SQL-запросы к базе данных
 # ----------------------------
 
-def execute_queries(conn, n=5):
+STAR_COLUMNS = [('s.name', 'star'), ('c.name', 'constellation')]
+JOIN_CONSTELLATION = 'JOIN constellations c ON s.constellation_id = c.id'
+
+def top_stars_sql(order_by, value, where=None, partition_by=None, columns=STAR_COLUMNS, strategy='index'):
+    return top_n_sql('stars', 's', columns + [value], order_by, partition_by,
+                     JOIN_CONSTELLATION, where, strategy=strategy)
+
+# Запросы отчётов: (заголовок, SQL, N, столбцы, шаблон строки)
+def report_queries(n=5, strategy='index'):
+    distance = ('s.distance', 'distance')
+    planets = ('s.planets_count', 'planets')
+    return [
+        (f"Топ-{n} ближайших систем:",
+         top_stars_sql('s.distance', distance, 's.distance IS NOT NULL'), n,
+         ["star", "constellation", "distance"], "{0} ({1}): {2} св. лет"),
+        (f"Топ-{n} самых далеких систем:",
+         top_stars_sql('s.distance DESC', distance, 's.distance IS NOT NULL'), n,
+         ["star", "constellation", "distance"], "{0} ({1}): {2} св. лет"),
+        (f"Топ-{n} систем по количеству планет:",
+         top_stars_sql('s.planets_count DESC', planets), n,
+         ["star", "constellation", "planets"], "{0} ({1}): {2} планет"),
+        # Одна система с наибольшим числом планет в каждом созвездии
+        ("Самые богатые системы по созвездиям:",
+         top_stars_sql('s.planets_count DESC', planets, partition_by='s.constellation_id',
+                       columns=STAR_COLUMNS[::-1], strategy=strategy), 1,
+         ["constellation", "star", "planets"], "{0}: {1} ({2} планет)"),
+    ]
+
+def execute_queries(conn, n=5, fmt='table', output=None, chunk_size=CHUNK_SIZE):
     cursor = conn.cursor()
     
-    print(f"\nТоп-{n} ближайших систем:")
-    cursor.execute('''
-    SELECT s.name, c.name, s.distance 
-    FROM stars s
-    JOIN constellations c ON s.constellation_id = c.id
-    WHERE s.distance IS NOT NULL
-    ORDER BY s.distance ASC
-    LIMIT ?
-    ''', (n,))
-    for row in cursor.fetchall():
-        print(f"{row[0]} ({row[1]}): {row[2]} св. лет")
-
-    print(f"\nТоп-{n} самых далеких систем:")
-    cursor.execute('''
-    SELECT s.name, c.name, s.distance 
-    FROM stars s
-    JOIN constellations c ON s.constellation_id = c.id
-    WHERE s.distance IS NOT NULL
-    ORDER BY s.distance DESC
-    LIMIT ?
-    ''', (n,))
-    for row in cursor.fetchall():
-        print(f"{row[0]} ({row[1]}): {row[2]} св. лет")
-
-    print(f"\nТоп-{n} систем по количеству планет:")
-    cursor.execute('''
-    SELECT s.name, c.name, s.planets_count 
-    FROM stars s
-    JOIN constellations c ON s.constellation_id = c.id
-    ORDER BY s.planets_count DESC
-    LIMIT ?
-    ''', (n,))
-    for row in cursor.fetchall():
-        print(f"{row[0]} ({row[1]}): {row[2]} планет")
-
-    print("\nСамые богатые системы по созвездиям:")
-    cursor.execute('''
-    SELECT 
-        c.name AS constellation,
-        s.name AS star,
-        MAX(s.planets_count) AS max_planets
-    FROM stars s
-    JOIN constellations c ON s.constellation_id = c.id
-    GROUP BY c.id
-    ''')
-    for row in cursor.fetchall():
-        print(f"{row[0]}: {row[1]} ({row[2]} планет)")
+    with report_output(fmt, output) as out_for:
+        for title, sql, top, columns, template in report_queries(n):
+            run_report(cursor, title, sql, {'top_n': top}, fmt, out_for(title), columns,
+                       template=template, chunk_size=chunk_size)
 
 # ----------------------------
 # Главная функция
 # ----------------------------
 
 def main():
+    parser = argparse.ArgumentParser(description="База данных кратных планетных систем")
+    parser.add_argument('--max-delete-share', type=float, default=MAX_DELETE_SHARE,
+                        help='какую долю звёзд можно удалить за одну синхронизацию (1 — без ограничения)')
+    add_report_arguments(parser)
+    parser.add_argument('--offline', action='store_true', help='брать страницу только из кэша')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='каталог HTTP-кэша')
+    parser.add_argument('--fixture', help='сохранённый HTML-файл страницы вместо загрузки')
+    parser.add_argument('--parser', choices=PARSERS, help='способ разбора HTML (по умолчанию lxml, если установлен)')
+    args = parse_report_arguments(parser)
+    log = status_stream(args)
+
     # Парсим данные
-    print("Парсинг данных с Википедии...")
-    data = parse_wikipedia_data()
+    print("Парсинг данных с Википедии...", file=log)
+    if args.fixture:
+        # Сохранённая страница кладётся в кэш, чтобы дальше работать офлайн
+        HttpCache(args.cache_dir).add_fixture(WIKI_URL, args.fixture)
+    data = parse_wikipedia_data(parser=args.parser, offline=args.offline or bool(args.fixture),
+                                cache_dir=args.cache_dir)
     
     # Создаем БД
-    print("Создание базы данных...")
+    print("Создание базы данных...", file=log)
     conn = create_database_schema()
     
-    # Заполняем БД
-    print("Заполнение базы данных...")
-    populate_database(conn, data)
+    # Синхронизируем БД: меняются только звёзды, изменившиеся с прошлого запуска
+    print("Синхронизация базы данных...", file=log)
+    try:
+        stats = sync_database(conn, data, max_delete_share=args.max_delete_share)
+    except RuntimeError as e:
+        conn.close()
+        sys.exit(str(e))
+    print(f"Добавлено: {stats['inserted']}, обновлено: {stats['updated']}, "
+          f"удалено: {stats['deleted']}, без изменений: {stats['unchanged']}", file=log)
     
     # Выполняем запросы
-    print("Выполнение запросов...")
-    execute_queries(conn)
+    print("Выполнение запросов...", file=log)
+    execute_queries(conn, fmt=args.format, output=args.output, chunk_size=args.chunk_size)
     
     # Закрываем соединение
     conn.close()
-    print("\nГотово! База данных сохранена в файле 'exoplanets.db'")
+    print("\nГотово! База данных сохранена в файле 'exoplanets.db'", file=log)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
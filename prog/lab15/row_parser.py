@@ -0,0 +1,82 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Разбор строк таблицы кратных систем: каждая ячейка обрабатывается
+# один раз, шаблоны компилируются при импорте модуля
+
+# Сноски Википедии вида [1], [a], [прим. 2]
+FOOTNOTE = re.compile(r'\[[^\]]*\]')
+# Перед первым числом пропускаются любые символы и сноски целиком, поэтому
+# сноски не нужно вырезать из ячейки отдельной подстановкой. Открывающая
+# скобка считается обычным символом, только если сноска не закрыта: иначе
+# в ячейке из одной сноски "[1]" числом стала бы цифра из сноски
+SKIP = r'(?:\[[^\]]*\]|[^\d\[]|\[(?![^\]]*\]))*?'
+# Число с разделителями тысяч (обычный, неразрывный и узкий пробел)
+# и десятичной точкой или запятой
+NUMBER = re.compile(SKIP + r'(\d(?:[\d \u00a0\u2009\u202f]*\d)?(?:[.,]\d+)?)')
+NORMALIZE_NUMBER = str.maketrans({',': '.', ' ': None, '\u00a0': None, '\u2009': None, '\u202f': None})
+INTEGER = re.compile(SKIP + r'(\d+)')
+
+MIN_COLUMNS = 7
+
+
+class StarRow(NamedTuple):
+    star: str
+    constellation: str
+    distance: Optional[float]
+    spectral_class: str
+    planets: int
+
+
+def parse_distance(text):
+    # Берём первое число: сноски и погрешности (±) к расстоянию не приклеиваются
+    match = NUMBER.match(text)
+    if match is None:
+        return None
+    number = match.group(1)
+    try:
+        return float(number)
+    except ValueError:
+        # Запятая или пробелы внутри числа встречаются редко
+        return float(number.translate(NORMALIZE_NUMBER))
+
+
+# Классы и числа планет в таблице часто повторяются, поэтому результаты
+# разбора этих ячеек кэшируются
+@lru_cache(maxsize=4096)
+def parse_spectral_class(text):
+    # Пустая ячейка даёт пустой класс, а не ошибку разбора
+    if '[' in text:
+        text = FOOTNOTE.sub('', text)
+    tokens = text.split(None, 1)
+    return tokens[0] if tokens else ''
+
+
+@lru_cache(maxsize=4096)
+def parse_planets(text):
+    # Первое целое число, примечания в скобках игнорируются
+    match = INTEGER.match(text)
+    return int(match.group(1)) if match else 0
+
+
+def parse_row(cols):
+    if len(cols) < MIN_COLUMNS:
+        return None
+    return StarRow(
+        cols[0],
+        cols[1],
+        parse_distance(cols[2]),
+        parse_spectral_class(cols[3]),
+        parse_planets(cols[-1]),
+    )
+
+
+def parse_rows(rows):
+    # Тот же parse_row без лишних вызовов: tuple.__new__ обходит
+    # питоновский конструктор именованного кортежа
+    new = tuple.__new__
+    for cols in rows:
+        if len(cols) >= MIN_COLUMNS:
+            yield new(StarRow, (cols[0], cols[1], parse_distance(cols[2]),
+                                parse_spectral_class(cols[3]), parse_planets(cols[-1])))
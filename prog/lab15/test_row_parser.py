@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from row_parser import StarRow, parse_distance, parse_planets, parse_row, parse_rows, parse_spectral_class
+
+# Ячейки таблицы Википедии в том виде, в котором они приходят из HTML:
+# сноски, погрешности, десятичные запятые, разделители тысяч, пустые ячейки
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('42', 42.0),
+    ('4.24', 4.24),
+    ('2019.2[1]', 2019.2),
+    ('2019.2[1][2]', 2019.2),
+    ('[a]15.3', 15.3),
+    ('[прим. 2] 15.3', 15.3),
+    ('10.5 ± 0.3', 10.5),
+    ('10.5±0.3[4]', 10.5),
+    ('~ 41.3', 41.3),
+    ('10,5', 10.5),
+    ('1 234', 1234.0),
+    ('1 234,5', 1234.5),
+    ('1 234 567', 1234567.0),
+    ('2 700 ± 100', 2700.0),
+    ('', None),
+    ('—', None),
+    ('[1]', None),
+])
+def test_parse_distance(text, expected):
+    assert parse_distance(text) == expected
+
+
+# Свойство: как бы ни было оформлено число в ячейке, разбирается оно само
+_rnd = random.Random(0)
+DISTANCES = [round(_rnd.uniform(0, 100_000), _rnd.randint(0, 3)) for _ in range(50)]
+DECORATIONS = [
+    lambda number: number,
+    lambda number: f'{number}[1]',
+    lambda number: f'[a] {number}',
+    lambda number: f'{number} ± 0.5',
+    lambda number: f'≈{number}[прим. 3]',
+]
+
+
+@pytest.mark.parametrize('value', DISTANCES)
+@pytest.mark.parametrize('decorate', DECORATIONS)
+@pytest.mark.parametrize('separator, point', [('', '.'), (' ', '.'), (' ', ','), (' ', ',')])
+def test_parse_distance_formats(value, decorate, separator, point):
+    number = f'{value:,}'.replace(',', '\x00').replace('.', point).replace('\x00', separator)
+    assert parse_distance(decorate(number)) == pytest.approx(value)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('3', 3),
+    ('3[1]', 3),
+    ('[2] 4', 4),
+    ('[прим. 7]2', 2),
+    ('5 (1 неподтверждённая)', 5),
+    ('2,5', 2),
+    ('', 0),
+    ('?', 0),
+    ('[1]', 0),
+])
+def test_parse_planets(text, expected):
+    assert parse_planets(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('G2V', 'G2V'),
+    ('K1III[2]', 'K1III'),
+    ('[a] F8V', 'F8V'),
+    ('M4.5V / M5V', 'M4.5V'),
+    ('', ''),
+    ('   ', ''),
+    ('[1]', ''),
+])
+def test_parse_spectral_class(text, expected):
+    assert parse_spectral_class(text) == expected
+
+
+ROWS = [
+    ['Солнце', 'Нет', '0', 'G2V', '', '', '8'],
+    ['Kepler-90', 'Дракон', '2 840[1]', 'G0V[2]', '', '', '8[3]'],
+    ['Gliese 667 C', 'Скорпион', '23,6 ± 0,1', '', '', '', ''],
+    ['Короткая', 'Строка'],
+]
+
+
+def test_parse_rows_matches_parse_row():
+    expected = [parse_row(cols) for cols in ROWS if parse_row(cols) is not None]
+    assert list(parse_rows(ROWS)) == expected
+    assert expected == [
+        StarRow('Солнце', 'Нет', 0.0, 'G2V', 8),
+        StarRow('Kepler-90', 'Дракон', 2840.0, 'G0V', 8),
+        StarRow('Gliese 667 C', 'Скорпион', 23.6, '', 0),
+    ]
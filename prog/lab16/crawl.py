@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from database import create_tables, insert_books
+from pages import category_id, make_soup, next_page, parse_books, parse_categories
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
+from common.crawler import Crawler
+
+BASE_URL = "https://books.toscrape.com/"
+
+
+# Главная страница даёт категории, страницы категорий — книги и ссылку на следующую страницу
+def parse_page(url, html):
+    soup = make_soup(html)
+    current = category_id(url)
+    if current is None:
+        categories = parse_categories(soup, url)
+        # Корневая категория "Books" содержит все книги сразу, её страницы не обходим
+        links = [c['url'] for c in categories if c['id'] != 1]
+        return [('category', c) for c in categories], links
+
+    books = [dict(book, category_id=current) for book in parse_books(soup)]
+    following = next_page(soup, url)
+    return [('book', b) for b in books], [following] if following else []
+
+
+def make_writer(conn):
+    def write(rows):
+        categories = [row for kind, row in rows if kind == 'category']
+        books = [row for kind, row in rows if kind == 'book']
+        if categories:
+            conn.cursor().executemany('''
+            INSERT OR IGNORE INTO categories (id, name, url)
+            VALUES (:id, :name, :url)
+            ''', categories)
+            conn.commit()
+        if books:
+            insert_books(conn, books)
+    return write
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Асинхронный обход всех страниц каталога книг")
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help='адрес сайта (например, локальный сервер с сохранёнными страницами)')
+    parser.add_argument('--db', default='library.db')
+    parser.add_argument('--concurrency', type=int, default=8, help='одновременных запросов')
+    parser.add_argument('--rate', type=float, default=5.0, help='запросов в секунду к одному хосту')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--state', default='crawl_state.jsonl',
+                        help='журнал прогресса для продолжения прерванного обхода')
+    args = parser.parse_args()
+
+    # Запись идёт из отдельного потока обходчика
+    conn = db.connect(args.db, check_same_thread=False)
+    try:
+        create_tables(conn)
+        crawler = Crawler(args.concurrency, args.rate, args.retries, state_file=args.state)
+        stats = asyncio.run(crawler.run([args.base_url], parse_page, make_writer(conn)))
+    finally:
+        conn.close()
+    print(f"Страниц: {stats['pages']}, записей: {stats['rows']}, ошибок: {stats['errors']}, "
+          f"{stats['pages'] / stats['elapsed']:.1f} страниц/с")
+
+
+if __name__ == "__main__":
+    main()
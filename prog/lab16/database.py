@@ -22,6 +22,18 @@ def create_tables(conn):
         FOREIGN KEY (category_id) REFERENCES categories(id)
     )
     ''')
+    
+    # Книга определяется названием и категорией: повторный обход той же
+    # страницы не создаёт дублей. В старой базе дубли сначала удаляются
+    cursor.execute('''
+    SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_books_title_category'
+    ''')
+    if cursor.fetchone() is None:
+        cursor.execute('''
+        DELETE FROM books
+        WHERE id NOT IN (SELECT MIN(id) FROM books GROUP BY title, category_id)
+        ''')
+        cursor.execute('CREATE UNIQUE INDEX idx_books_title_category ON books(title, category_id)')
     conn.commit()
 
 def insert_data(conn, books, categories):
@@ -39,4 +51,13 @@ def insert_data(conn, books, categories):
     VALUES (:id, :title, :price, :category_id)
     ''', books)
     
+    conn.commit()
+
+def insert_books(conn, books):
+    # Книги без заранее известного id (обходчик страниц): id назначает SQLite,
+    # уже сохранённые книги пропускаются по уникальному индексу
+    conn.cursor().executemany('''
+    INSERT OR IGNORE INTO books (title, price, category_id)
+    VALUES (:title, :price, :category_id)
+    ''', books)
     conn.commit()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# Разбор статических страниц books.toscrape.com теми же CSS-селекторами,
+# что и в Selenium-парсере
+
+PRICE = re.compile(r'[^\d.]')
+# Номер категории зашит в адрес: catalogue/category/books/travel_2/index.html
+CATEGORY_ID = re.compile(r'/category/books(?:/[^/]*)?_(\d+)/')
+
+
+def make_soup(html):
+    try:
+        return BeautifulSoup(html, 'lxml')
+    except FeatureNotFound:
+        return BeautifulSoup(html, 'html.parser')
+
+
+def category_id(url):
+    match = CATEGORY_ID.search(url)
+    return int(match.group(1)) if match else None
+
+
+def parse_categories(soup, page_url):
+    categories = []
+    for idx, link in enumerate(soup.select(".nav-list li a"), 1):
+        url = urljoin(page_url, link['href'])
+        categories.append({
+            'id': category_id(url) or idx,
+            'name': link.get_text(strip=True),
+            'url': url
+        })
+    return categories
+
+
+def parse_books(soup):
+    books = []
+    for book in soup.select("article.product_pod"):
+        books.append({
+            'title': book.select_one("h3 a")['title'],
+            'price': float(PRICE.sub('', book.select_one(".price_color").get_text()))
+        })
+    return books
+
+
+def next_page(soup, page_url):
+    link = soup.select_one("li.next a")
+    return urljoin(page_url, link['href']) if link else None
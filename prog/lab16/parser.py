@@ -1,14 +1,25 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import sqlite3
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from database import create_tables, insert_data
+from pages import make_soup, parse_books, parse_categories
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
 
-# Настройка браузера
+BASE_URL = "https://books.toscrape.com/"
+
+# Настройка браузера (Selenium подключается только при выборе этого режима)
 def setup_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
     options = webdriver.ChromeOptions()
     options.add_argument('--headless')  # Фоновый режим
     driver = webdriver.Chrome(
@@ -18,8 +29,12 @@ def setup_driver():
     return driver
 
 # Парсинг данных с сайта
-def parse_data(driver):
-    driver.get("https://books.toscrape.com/")
+def parse_data(driver, url=BASE_URL):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    driver.get(url)
     books_data = []
     categories_data = []
 
@@ -52,17 +67,80 @@ def parse_data(driver):
     
     return books_data, categories_data
 
+# Сессия с пулом соединений для режима без браузера
+def setup_session(pool_size=10):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Парсинг той же страницы обычным HTTP-запросом и теми же селекторами
+def parse_data_http(session, url=BASE_URL):
+    response = session.get(url, timeout=30)
+    response.raise_for_status()
+    soup = make_soup(response.content)
+
+    categories_data = []
+    for idx, category in enumerate(parse_categories(soup, url)[:5], 1):  # Берем 5 категорий
+        categories_data.append(dict(category, id=idx))
+
+    books_data = []
+    for idx, book in enumerate(parse_books(soup)[:10], 1):  # Берем 10 книг
+        category_id = (idx % len(categories_data)) + 1  # Распределение по категориям
+        books_data.append(dict(book, id=idx, category_id=category_id))
+
+    return books_data, categories_data
+
+MODES = {
+    'http': (setup_session, parse_data_http, lambda session: session.close()),
+    'selenium': (setup_driver, parse_data, lambda driver: driver.quit()),
+}
+
+# Замер времени запуска и скорости обработки страниц каталога
+def benchmark(mode, pages=10, base_url=BASE_URL):
+    setup, parse, teardown = MODES[mode]
+    start = time.perf_counter()
+    client = setup()
+    startup = time.perf_counter() - start
+    try:
+        start = time.perf_counter()
+        for page in range(1, pages + 1):
+            parse(client, f"{base_url}catalogue/page-{page}.html")
+        elapsed = time.perf_counter() - start
+    finally:
+        teardown(client)
+    print(f"{mode:<10} запуск: {startup:.2f} с, {pages / elapsed:.1f} страниц/с")
+
 def main():
-    driver = setup_driver()
+    parser = argparse.ArgumentParser(description="Парсер каталога книг")
+    parser.add_argument('--mode', choices=MODES, default='http',
+                        help='http — без браузера (по умолчанию), selenium — через Chrome')
+    parser.add_argument('--benchmark', action='store_true', help='сравнить режимы по скорости')
+    parser.add_argument('--pages', type=int, default=10, help='страниц каталога для замера')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        for mode in MODES:
+            try:
+                benchmark(mode, args.pages)
+            except ImportError as e:
+                print(f"{mode:<10} пропущен: {e}")
+        return
+
+    setup, parse, teardown = MODES[args.mode]
+    client = setup()
+    conn = None
     try:
-        books, categories = parse_data(driver)
-        conn = sqlite3.connect('library.db')
+        books, categories = parse(client)
+        conn = db.connect('library.db')
         create_tables(conn)
         insert_data(conn, books, categories)
         print("Данные успешно сохранены в БД")
     finally:
-        driver.quit()
-        conn.close()
+        teardown(client)
+        if conn is not None:
+            conn.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
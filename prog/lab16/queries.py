@@ -1,13 +1,23 @@
-import sqlite3
-from pypika import Query, Table, Field, functions as fn
+import argparse
+import sys
+import time
+from pathlib import Path
+from pypika import Parameter, Query, Table, Field, functions as fn
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common import db
+from common.reports import (CHUNK_SIZE, add_report_arguments, parse_report_arguments, report_output,
+                            status_stream, stream_report)
+from query_registry import QueryRegistry
 
 # Инициализация таблиц
 books = Table('books')
 categories = Table('categories')
 
+# Значения фильтров не вшиваются в SQL, а передаются параметрами
 # 2 запроса с JOIN
-def join_query_1():
-    return Query \
+def join_query_1(price_range=False):
+    query = Query \
         .from_(books) \
         .join(categories) \
         .on(books.category_id == categories.id) \
@@ -16,6 +26,9 @@ def join_query_1():
             categories.name.as_('category'),
             books.price
         )
+    if price_range:
+        query = query.where(books.price.between(Parameter('?'), Parameter('?')))
+    return query
 
 def join_query_2():
     return Query \
@@ -29,12 +42,15 @@ def join_query_2():
         .groupby(categories.name)
 
 # 3 запроса с агрегацией
-def aggregate_query_1():
-    return Query \
+def aggregate_query_1(by_category=False):
+    query = Query \
         .from_(books) \
         .select(
             fn.Avg(books.price).as_('avg_price')
         )
+    if by_category:
+        query = query.where(books.category_id == Parameter('?'))
+    return query
 
 def aggregate_query_2():
     return Query \
@@ -56,25 +72,64 @@ def aggregate_query_3():
         ) \
         .groupby(categories.name)
 
+# Список запросов: (название, построитель, опции построителя, параметры)
+def report_queries(min_price=None, max_price=None, category_id=None):
+    price_range = min_price is not None or max_price is not None
+    price_args = (min_price if min_price is not None else 0,
+                  max_price if max_price is not None else float('inf'))
+    by_category = category_id is not None
+    return [
+        ("JOIN 1", join_query_1, {'price_range': price_range}, price_args if price_range else ()),
+        ("JOIN 2", join_query_2, {}, ()),
+        ("Aggregate 1", aggregate_query_1, {'by_category': by_category}, (category_id,) if by_category else ()),
+        ("Aggregate 2", aggregate_query_2, {}, ()),
+        ("Aggregate 3", aggregate_query_3, {}, ()),
+    ]
+
 # Выполнение запросов
-def execute_queries():
-    conn = sqlite3.connect('library.db')
+def execute_queries(queries=None, registry=None, repeat=1, database='library.db',
+                    fmt='table', output=None, chunk_size=CHUNK_SIZE):
+    queries = queries or report_queries()
+    registry = registry or QueryRegistry()
+    conn = db.connect(database, readonly=True)
     cursor = conn.cursor()
     
-    queries = [
-        ("JOIN 1", join_query_1()),
-        ("JOIN 2", join_query_2()),
-        ("Aggregate 1", aggregate_query_1()),
-        ("Aggregate 2", aggregate_query_2()),
-        ("Aggregate 3", aggregate_query_3())
-    ]
-    
-    for name, query in queries:
-        print(f"\n{name}: {query.get_sql()}")
-        cursor.execute(query.get_sql())
-        print(cursor.fetchall())
+    with report_output(fmt, output) as out_for:
+        for run in range(repeat):
+            for name, builder, options, args in queries:
+                sql = registry.sql(builder, **options)
+                start = time.perf_counter()
+                cursor.execute(sql, args)
+                # Результат выводится только в первом прогоне, повторные нужны для замера
+                if run == 0:
+                    out = out_for(name)
+                    if fmt == 'table':
+                        print(f"\n{name}: {sql}" + (f" {list(args)}" if args else ""), file=out)
+                    stream_report(cursor, fmt, out, report=name if fmt == 'jsonl' else None,
+                                  chunk_size=chunk_size)
+                else:
+                    cursor.fetchall()
+                registry.record_execute(builder, options, time.perf_counter() - start)
     
     conn.close()
+    return registry
+
+def main():
+    parser = argparse.ArgumentParser(description="Запросы PyPika к базе книг")
+    parser.add_argument('--db', default='library.db')
+    parser.add_argument('--min-price', type=float, help='нижняя граница цены для JOIN 1')
+    parser.add_argument('--max-price', type=float, help='верхняя граница цены для JOIN 1')
+    parser.add_argument('--category', type=int, help='id категории для средней цены')
+    parser.add_argument('--repeat', type=int, default=1, help='сколько раз выполнить набор запросов')
+    parser.add_argument('--profile', action='store_true', help='время сборки и выполнения запросов')
+    add_report_arguments(parser)
+    args = parse_report_arguments(parser)
+
+    queries = report_queries(args.min_price, args.max_price, args.category)
+    registry = execute_queries(queries, repeat=args.repeat, database=args.db,
+                               fmt=args.format, output=args.output, chunk_size=args.chunk_size)
+    if args.profile:
+        registry.report(out=status_stream(args))
 
 if __name__ == "__main__":
-    execute_queries()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import time
+
+# Реестр скомпилированных запросов: построитель PyPika вызывается и
+# рендерится в SQL один раз на набор опций, дальше текст берётся из кэша.
+# Значения передаются только через параметры (Parameter('?')), поэтому
+# текст SQL не меняется от запуска к запуску и sqlite3 повторно использует
+# подготовленный запрос из своего кэша (cached_statements в db.connect).
+# Опции построителя — то, что меняет форму запроса (например, есть ли
+# фильтр), они входят в ключ кэша вместе с самим построителем.
+
+
+def _new_stats():
+    return {'builds': 0, 'build_time': 0.0, 'hits': 0, 'executions': 0, 'execute_time': 0.0}
+
+
+class QueryRegistry:
+    def __init__(self):
+        self._sql = {}
+        self.stats = {}
+
+    @staticmethod
+    def key(builder, options):
+        return builder, tuple(sorted(options.items()))
+
+    def sql(self, builder, **options):
+        key = self.key(builder, options)
+        stats = self.stats.setdefault(key, _new_stats())
+        sql = self._sql.get(key)
+        if sql is None:
+            start = time.perf_counter()
+            sql = builder(**options).get_sql()
+            stats['build_time'] += time.perf_counter() - start
+            stats['builds'] += 1
+            self._sql[key] = sql
+        else:
+            stats['hits'] += 1
+        return sql
+
+    def record_execute(self, builder, options, elapsed):
+        # Время замеряет вызывающий код: вместе с execute в него входит чтение строк
+        stats = self.stats.setdefault(self.key(builder, options), _new_stats())
+        stats['executions'] += 1
+        stats['execute_time'] += elapsed
+
+    def report(self, out=None):
+        print(f"\n{'Запрос':<40}{'сборок':>8}{'из кэша':>9}{'сборка, мс':>12}"
+              f"{'запусков':>10}{'выполнение, мс':>16}", file=out)
+        for (builder, options), stats in self.stats.items():
+            name = builder.__name__ + (f" {dict(options)}" if options else "")
+            print(f"{name:<40}{stats['builds']:>8}{stats['hits']:>9}{stats['build_time'] * 1000:>12.3f}"
+                  f"{stats['executions']:>10}{stats['execute_time'] * 1000:>16.3f}", file=out)
@@ -0,0 +1,86 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.db import ConnectionPool
+from queries import report_queries
+from query_registry import QueryRegistry
+
+# Параллельный запуск независимых запросов на читающих соединениях пула:
+# у каждого потока своё соединение, WAL позволяет читать одновременно.
+# Для каждого запроса сохраняется время, число строк и план выполнения,
+# итоговый профиль пишется в JSON для сравнения между запусками.
+
+
+def run_query(pool, name, sql, args):
+    with pool.reader() as conn:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", args)]
+        start = time.perf_counter()
+        rows = conn.execute(sql, args).fetchall()
+        elapsed = time.perf_counter() - start
+    return {
+        'name': name,
+        'sql': sql,
+        'args': list(args),
+        'rows': len(rows),
+        'wall_ms': round(elapsed * 1000, 3),
+        'plan': plan,
+    }
+
+
+def run_reports(database, queries=None, workers=4, registry=None):
+    queries = queries or report_queries()
+    registry = registry or QueryRegistry()
+    # SQL собирается заранее в основном потоке, в потоки уходит готовый текст
+    jobs = [(name, registry.sql(builder, **options), args) for name, builder, options, args in queries]
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    with ConnectionPool(database) as pool:
+        with pool.reader() as conn:
+            books_count = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda job: run_query(pool, *job), jobs))
+        elapsed = time.perf_counter() - start
+
+    return {
+        'started_at': started_at,
+        'database': str(database),
+        'books': books_count,
+        'workers': workers,
+        'wall_ms': round(elapsed * 1000, 3),
+        'queries': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Параллельный запуск отчётов с профилем времени")
+    parser.add_argument('--db', default='library.db')
+    parser.add_argument('--workers', type=int, default=4, help='потоков и читающих соединений')
+    parser.add_argument('--json', help='файл для профиля в JSON ("-" — stdout)')
+    args = parser.parse_args()
+
+    profile = run_reports(args.db, workers=args.workers)
+
+    if args.json == '-':
+        json.dump(profile, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+
+    print(f"Книг в базе: {profile['books']}, потоков: {profile['workers']}")
+    print(f"{'Запрос':<15}{'строк':>8}{'время, мс':>12}  план")
+    for query in profile['queries']:
+        print(f"{query['name']:<15}{query['rows']:>8}{query['wall_ms']:>12.3f}  {'; '.join(query['plan'])}")
+    print(f"Всего: {profile['wall_ms']:.3f} мс")
+
+
+if __name__ == "__main__":
+    main()
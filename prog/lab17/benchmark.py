@@ -0,0 +1,65 @@
+import argparse
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+
+from ingest import load
+from models import Dish, Order, TableInRestaurant, create_schema, make_engine
+from reports import ordered_dishes, revenue_by_table
+
+
+# Прежние отчёты: обход ORM-объектов и суммирование позиций в Python
+def revenue_orm_walk(session):
+    tables = session.scalars(
+        select(TableInRestaurant)
+        .options(joinedload(TableInRestaurant.orders).joinedload(Order.items))
+        .order_by(TableInRestaurant.number)
+    ).unique()
+    return [(table.number, len(table.orders), sum(item.amount for order in table.orders for item in order.items))
+            for table in tables]
+
+
+def dishes_orm_walk(session):
+    dishes = session.scalars(select(Dish).options(joinedload(Dish.order_items))).unique()
+    return sorted(((dish.name, len(dish.order_items), sum(item.quantity for item in dish.order_items))
+                   for dish in dishes if dish.order_items),
+                  key=lambda row: -row[1])
+
+
+def measure(engine, report):
+    with Session(engine) as session:
+        start = time.perf_counter()
+        result = report(session)
+        return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Агрегаты в SQL против обхода ORM-объектов")
+    parser.add_argument("--db", default="benchmark_restaurant.db")
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--dishes", type=int, default=50)
+    args = parser.parse_args()
+
+    if Path(args.db).exists():
+        Path(args.db).unlink()
+    engine = make_engine(f"sqlite:///{args.db}")
+    create_schema(engine)
+    start = time.perf_counter()
+    load(engine, args.tables, args.dishes, args.orders)
+    print(f"Сгенерировано {args.orders} заказов за {time.perf_counter() - start:.1f} с")
+
+    for title, walk, aggregate in [("Выручка по столикам", revenue_orm_walk, revenue_by_table),
+                                   ("Популярность блюд", dishes_orm_walk, ordered_dishes)]:
+        by_sql, sql_time = measure(engine, aggregate)
+        by_orm, orm_time = measure(engine, walk)
+        same = sorted(map(tuple, by_sql)) == sorted(by_orm)
+        print(f"{title}: ORM {orm_time:.2f} с, SQL {sql_time:.3f} с "
+              f"(ускорение {orm_time / sql_time:.0f}x, результаты совпадают: {same})")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import random
+import time
+from itertools import islice
+
+from sqlalchemy import func, insert, select
+
+from models import Dish, Order, TableInRestaurant, create_schema, engine_metrics, make_engine, order_dish
+
+# Массовая загрузка заказов через Core: строки заказов и связей с блюдами
+# уходят пачками одним executemany, без объектов ORM и unit of work.
+# id заказов назначаются на клиенте, поэтому строки order_dish можно
+# собрать сразу, не дожидаясь id от базы. Цена позиции и сумма заказа
+# тоже считаются здесь: событие before_flush для Core не срабатывает.
+
+BATCH_SIZE = 50_000
+
+tables = TableInRestaurant.__table__
+dishes = Dish.__table__
+orders = Order.__table__
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def next_id(conn, table):
+    return conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar_one() + 1
+
+
+def bulk_insert_tables(conn, numbers):
+    rows = [{"number": number} for number in numbers]
+    if rows:
+        conn.execute(insert(tables), rows)
+    return len(rows)
+
+
+def bulk_insert_dishes(conn, items):
+    # items: [(название, цена)]
+    rows = [{"name": name, "price": price} for name, price in items]
+    if rows:
+        conn.execute(insert(dishes), rows)
+    return len(rows)
+
+
+def bulk_insert_orders(conn, items, batch_size=BATCH_SIZE):
+    # items: итерируемое [(id столика, [(id блюда, порций)])]; возвращает число заказов
+    order_id = next_id(conn, orders)
+    prices = dict(conn.execute(select(dishes.c.id, dishes.c.price)).all())
+    count = 0
+    for batch in batched(items, batch_size):
+        order_rows = []
+        dish_rows = []
+        for table_id, lines in batch:
+            total = 0
+            for dish_id, quantity in lines:
+                price = prices[dish_id]
+                dish_rows.append({"order_id": order_id, "dish_id": dish_id,
+                                  "quantity": quantity, "unit_price": price})
+                total += quantity * price
+            order_rows.append({"id": order_id, "table_id": table_id, "total": total})
+            order_id += 1
+        conn.execute(insert(orders), order_rows)
+        if dish_rows:
+            conn.execute(insert(order_dish), dish_rows)
+        count += len(order_rows)
+    return count
+
+
+# Генератор синтетической нагрузки
+def generate_dishes(count, seed=0):
+    rnd = random.Random(seed)
+    return [(f"Блюдо {i}", rnd.randint(100, 1000)) for i in range(1, count + 1)]
+
+
+def generate_orders(count, table_ids, dish_ids, max_dishes=5, max_quantity=3, seed=0):
+    rnd = random.Random(seed)
+    max_dishes = min(max_dishes, len(dish_ids))
+    for _ in range(count):
+        yield rnd.choice(table_ids), [(dish_id, rnd.randint(1, max_quantity))
+                                      for dish_id in rnd.sample(dish_ids, rnd.randint(1, max_dishes))]
+
+
+def load(engine, tables_count, dishes_count, orders_count, max_dishes=5, batch_size=BATCH_SIZE, seed=0):
+    with engine.begin() as conn:
+        first_table = conn.execute(select(func.coalesce(func.max(tables.c.number), 0))).scalar_one() + 1
+        bulk_insert_tables(conn, range(first_table, first_table + tables_count))
+        bulk_insert_dishes(conn, generate_dishes(dishes_count, seed))
+        table_ids = conn.execute(select(tables.c.id)).scalars().all()
+        dish_ids = conn.execute(select(dishes.c.id)).scalars().all()
+        return bulk_insert_orders(conn, generate_orders(orders_count, table_ids, dish_ids, max_dishes, seed=seed),
+                                  batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация и массовая загрузка заказов ресторана")
+    parser.add_argument("--db", default="restaurant.db")
+    parser.add_argument("--tables", type=int, default=100, help="сколько столиков добавить")
+    parser.add_argument("--dishes", type=int, default=50, help="сколько блюд добавить")
+    parser.add_argument("--orders", type=int, default=1_000_000, help="сколько заказов сгенерировать")
+    parser.add_argument("--max-dishes", type=int, default=5, help="наибольшее число блюд в заказе")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = make_engine(f"sqlite:///{args.db}")
+    create_schema(engine)
+    start = time.perf_counter()
+    count = load(engine, args.tables, args.dishes, args.orders, args.max_dishes, args.batch_size, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Загружено {count} заказов за {elapsed:.1f} с ({count / elapsed * 60:,.0f} заказов в минуту)")
+    engine_metrics(engine).report()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
-from models import engine, TableInRestaurant, Order, Dish, Session
+import sys
 
-with Session(engine) as session:
+from models import TableInRestaurant, Order, Dish, Session, configure, engine_metrics, get_engine
+from reports import orders_by_table, ordered_dishes, revenue_by_table, run_report
+
+# python main.py --memory — демонстрация на базе в памяти без файла
+if "--memory" in sys.argv:
+    configure(memory=True)
+engine = get_engine()
+
+def seed_demo_data(session):
     # Создаём столики
     t1 = TableInRestaurant(number=1)
     t2 = TableInRestaurant(number=2)
@@ -15,27 +23,32 @@ with Session(engine) as session:
     session.add_all([t1, t2, d1, d2, d3, o1, o2, o3])
     session.commit()
 
+with Session(engine) as session:
+    # Тестовые данные добавляются только в пустую базу
+    if session.query(TableInRestaurant).first() is None:
+        seed_demo_data(session)
+
 # Все заказы для каждого столика
 
 with Session(engine) as session:
-    tables = session.query(TableInRestaurant).all()
-    for table in tables:
-        print(f"Столик {table.number}:")
-        for order in table.orders:
-            print(f"  Заказ {order.id}: {[dish.name for dish in order.dishes]}")
+    for number, orders in run_report(session, orders_by_table):
+        print(f"Столик {number}:")
+        for order_id, dishes, total in orders:
+            print(f"  Заказ {order_id}: {dishes}, сумма {total}")
 
 # Все блюда, которые были заказаны хотя бы раз
 
 with Session(engine) as session:
-    dishes = session.query(Dish).filter(Dish.orders.any()).all()
-    for d in dishes:
-        print(f"{d.name} — заказов: {len(d.orders)}")
+    for name, count, portions in run_report(session, ordered_dishes):
+        print(f"{name} — заказов: {count}, порций: {portions}")
 
 # Анализ: общее количество заказов, сумма всех заказов по столикам
 
 with Session(engine) as session:
-    for table in session.query(TableInRestaurant):
-        total = 0
-        for order in table.orders:
-            total += sum(dish.price for dish in order.dishes)
-        print(f"Столик {table.number}: сумма заказов = {total}")
\ No newline at end of file
+    for number, orders, total in run_report(session, revenue_by_table):
+        print(f"Столик {number}: заказов = {orders}, сумма заказов = {total}")
+
+# Статистика пула соединений и SQL-запросов за запуск
+
+print()
+engine_metrics(engine).report()
\ No newline at end of file
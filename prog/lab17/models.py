@@ -1,34 +1,84 @@
-from sqlalchemy import create_engine, Column, Integer, String, ForeignKey, Table
+import time
+import weakref
+
+from sqlalchemy import create_engine, event, inspect, text, Column, Integer, String, ForeignKey
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import DeclarativeBase, relationship, Session
+from sqlalchemy.pool import StaticPool
+
+# Подключение к SQLite (или поменяйте на нужную вам БД).
+# Движок создаётся при первом обращении (get_engine), а не при импорте
+DEFAULT_URL = 'sqlite:///restaurant.db'
 
-# Подключение к SQLite (или поменяйте на нужную вам БД)
-engine = create_engine('sqlite:///restaurant.db')
+# Настройки каждого нового соединения SQLite
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,       # 64 МБ страничного кэша
+    'mmap_size': 268435456,     # 256 МБ файла читаются через mmap
+}
 
 class Base(DeclarativeBase):
     pass
 
-# Промежуточная таблица многие-ко-многим
-order_dish = Table(
-    'order_dish',
-    Base.metadata,
-    Column('order_id', ForeignKey('orders.id'), primary_key=True),
-    Column('dish_id', ForeignKey('dishes.id'), primary_key=True)
-)
+# Позиция заказа (объект-ассоциация многие-ко-многим): количество порций
+# и цена блюда на момент заказа, чтобы старые заказы не зависели от
+# текущей цены в меню
+class OrderItem(Base):
+    __tablename__ = "order_dish"
+    order_id = Column(Integer, ForeignKey("orders.id"), primary_key=True)
+    dish_id = Column(Integer, ForeignKey("dishes.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False, default=1)
+    unit_price = Column(Integer, nullable=False)
+
+    order = relationship("Order", back_populates="items")
+    dish = relationship("Dish", back_populates="order_items")
+
+    def __init__(self, dish=None, quantity=1, unit_price=None, **kwargs):
+        if unit_price is None and dish is not None:
+            unit_price = dish.price
+        super().__init__(dish=dish, quantity=quantity, unit_price=unit_price, **kwargs)
+
+    @property
+    def amount(self):
+        return self.quantity * self.unit_price
+
+# Таблица связи для запросов Core
+order_dish = OrderItem.__table__
 
 class TableInRestaurant(Base):
     __tablename__ = "tables"
     id = Column(Integer, primary_key=True)
     number = Column(Integer, unique=True, nullable=False)
 
-    orders = relationship("Order", back_populates="table")
+    # Заказы и позиции всегда идут по id: joinedload сам порядок не задаёт
+    orders = relationship("Order", back_populates="table", order_by="Order.id")
 
 class Order(Base):
     __tablename__ = "orders"
     id = Column(Integer, primary_key=True)
     table_id = Column(Integer, ForeignKey("tables.id"))
+    # Сумма заказа хранится в самом заказе и пересчитывается при сохранении
+    total = Column(Integer, nullable=False, default=0)
 
     table = relationship("TableInRestaurant", back_populates="orders")
-    dishes = relationship("Dish", secondary=order_dish, back_populates="orders")
+    items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan",
+                         order_by="OrderItem.dish_id")
+    # Список блюд как раньше: Order(dishes=[...]) создаёт позиции по одной порции
+    dishes = association_proxy("items", "dish", creator=lambda dish: OrderItem(dish=dish))
+
+    def add_dish(self, dish, quantity=1):
+        # Повторное блюдо увеличивает количество порций, а не создаёт позицию
+        for item in self.items:
+            if item.dish is dish:
+                item.quantity += quantity
+                return item
+        item = OrderItem(dish=dish, quantity=quantity)
+        self.items.append(item)
+        return item
+
+    def recalculate_total(self):
+        self.total = sum(item.amount for item in self.items)
 
 class Dish(Base):
     __tablename__ = "dishes"
@@ -36,7 +86,150 @@ class Dish(Base):
     name = Column(String, nullable=False)
     price = Column(Integer, nullable=False)
 
-    orders = relationship("Order", secondary=order_dish, back_populates="dishes")
+    order_items = relationship("OrderItem", back_populates="dish")
+    orders = relationship("Order", secondary="order_dish", viewonly=True)
+
+# Перед записью пересчитываем суммы заказов, у которых менялись позиции
+@event.listens_for(Session, "before_flush")
+def update_order_totals(session, flush_context, instances):
+    changed = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Order):
+            changed.add(obj)
+        elif isinstance(obj, OrderItem) and obj.order is not None:
+            changed.add(obj.order)
+    for order in changed:
+        if order not in session.deleted:
+            order.recalculate_total()
+
+# Приведение базы, созданной до появления количества, цены и суммы заказа
+def upgrade_schema(bind):
+    columns = {
+        table: {column['name'] for column in inspect(bind).get_columns(table)}
+        for table in ('order_dish', 'orders')
+    }
+    with bind.begin() as conn:
+        if 'quantity' not in columns['order_dish']:
+            conn.execute(text('ALTER TABLE order_dish ADD COLUMN quantity INTEGER NOT NULL DEFAULT 1'))
+        if 'unit_price' not in columns['order_dish']:
+            conn.execute(text('ALTER TABLE order_dish ADD COLUMN unit_price INTEGER'))
+            conn.execute(text('''
+            UPDATE order_dish
+            SET unit_price = (SELECT price FROM dishes WHERE dishes.id = order_dish.dish_id)
+            '''))
+        if 'total' not in columns['orders']:
+            conn.execute(text('ALTER TABLE orders ADD COLUMN total INTEGER NOT NULL DEFAULT 0'))
+            conn.execute(text('''
+            UPDATE orders
+            SET total = (SELECT COALESCE(SUM(quantity * unit_price), 0)
+                         FROM order_dish WHERE order_dish.order_id = orders.id)
+            '''))
+
+# Счётчики пула и время SQL-запросов одного движка
+class EngineMetrics:
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.statements = 0
+        self.statement_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+
+    def attach(self, engine):
+        event.listen(engine, 'connect', self._connect)
+        event.listen(engine, 'checkout', self._checkout)
+        event.listen(engine, 'checkin', self._checkin)
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+
+    def _connect(self, dbapi_connection, connection_record):
+        self.connects += 1
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+
+    def _checkin(self, dbapi_connection, connection_record):
+        self.checkins += 1
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        self.statements += 1
+        self.statement_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def as_dict(self):
+        return {
+            'connects': self.connects,
+            'checkouts': self.checkouts,
+            'checkins': self.checkins,
+            'statements': self.statements,
+            'statement_ms': round(self.statement_time * 1000, 3),
+            'slowest_ms': round(self.slowest_time * 1000, 3),
+            'slowest_statement': self.slowest_statement,
+        }
+
+    def report(self):
+        print(f"Соединений: {self.connects}, выдач из пула: {self.checkouts}, возвратов: {self.checkins}")
+        print(f"SQL-запросов: {self.statements} за {self.statement_time * 1000:.1f} мс, "
+              f"самый долгий {self.slowest_time * 1000:.1f} мс")
+
+_metrics = weakref.WeakKeyDictionary()
+
+def engine_metrics(engine):
+    return _metrics[engine]
+
+def make_engine(url=DEFAULT_URL, memory=False, pragmas=PRAGMAS, **kwargs):
+    # memory=True — база в памяти с одним общим соединением (StaticPool),
+    # чтобы все сессии, в том числе из других потоков, видели одни данные
+    if memory:
+        engine = create_engine('sqlite://', poolclass=StaticPool,
+                               connect_args={'check_same_thread': False}, **kwargs)
+        pragmas = {name: value for name, value in pragmas.items()
+                   if name not in ('journal_mode', 'mmap_size')}
+    else:
+        engine = create_engine(url, **kwargs)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+    metrics = EngineMetrics()
+    metrics.attach(engine)
+    _metrics[engine] = metrics
+    return engine
+
+def create_schema(engine):
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+# Движок по умолчанию: создаётся вместе со схемой при первом обращении
+_engine = None
+_engine_options = {'url': DEFAULT_URL}
+
+def configure(url=DEFAULT_URL, memory=False, **kwargs):
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+    _engine_options.clear()
+    _engine_options.update(url=url, memory=memory, **kwargs)
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        engine = make_engine(**_engine_options)
+        create_schema(engine)
+        _engine = engine
+    return _engine
 
-# Создаём таблицы
-Base.metadata.create_all(bind=engine)
\ No newline at end of file
+def get_session(**kwargs):
+    return Session(get_engine(), **kwargs)
@@ -0,0 +1,104 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import joinedload
+
+from models import Dish, Order, OrderItem, TableInRestaurant, order_dish
+
+# Отчёты по заказам. Связанные заказы и блюда подгружаются в том же
+# SELECT через joinedload, а не ленивыми запросами на каждый столик,
+# заказ и блюдо, поэтому число SQL-запросов на отчёт постоянно.
+# selectinload здесь не подходит: он делит IN-список на пачки по 500
+# родителей, и число запросов росло бы вместе с данными.
+
+
+# Счётчик SQL-запросов, которые движок отправил в базу
+class StatementCounter:
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def count_statements(engine):
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+def _tables_with_orders(session):
+    return session.scalars(
+        select(TableInRestaurant)
+        .options(joinedload(TableInRestaurant.orders).joinedload(Order.items).joinedload(OrderItem.dish))
+        .order_by(TableInRestaurant.number)
+    ).unique()
+
+
+def _item_title(item):
+    return item.dish.name if item.quantity == 1 else f"{item.dish.name} x{item.quantity}"
+
+
+# Все заказы для каждого столика: [(номер столика, [(id заказа, [блюда], сумма)])]
+def orders_by_table(session):
+    return [
+        (table.number, [(order.id, [_item_title(item) for item in order.items], order.total)
+                        for order in table.orders])
+        for table in _tables_with_orders(session)
+    ]
+
+
+# Агрегаты считаются в SQL (func.count/func.sum + GROUP BY) одним запросом:
+# в Python приходят готовые строки, ORM-объекты не создаются
+
+# Блюда, заказанные хотя бы раз: [(название, число заказов, порций)]
+def ordered_dishes(session):
+    orders = func.count(order_dish.c.order_id)
+    return session.execute(
+        select(Dish.name, orders, func.sum(order_dish.c.quantity))
+        .join(order_dish, order_dish.c.dish_id == Dish.id)
+        .group_by(Dish.id)
+        .order_by(orders.desc(), Dish.id)
+    ).all()
+
+
+# Число заказов и выручка по столикам: [(номер столика, заказов, сумма)].
+# Выручка читается из сохранённой суммы заказа, позиции и блюда не нужны
+def revenue_by_table(session):
+    return session.execute(
+        select(
+            TableInRestaurant.number,
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.total), 0),
+        )
+        .outerjoin(Order, Order.table_id == TableInRestaurant.id)
+        .group_by(TableInRestaurant.id)
+        .order_by(TableInRestaurant.number)
+    ).all()
+
+
+# Сколько SQL-запросов допускается на каждый отчёт
+STATEMENT_BUDGET = {
+    orders_by_table: 1,
+    ordered_dishes: 1,
+    revenue_by_table: 1,
+}
+
+
+def run_report(session, report):
+    # Отчёт выполняется со счётчиком; лишний запрос означает,
+    # что где-то снова сработала ленивая загрузка (N+1)
+    with count_statements(session.get_bind()) as counter:
+        result = report(session)
+    assert counter.count == STATEMENT_BUDGET[report], (
+        f"{report.__name__}: {counter.count} SQL-запросов вместо {STATEMENT_BUDGET[report]}"
+    )
+    return result